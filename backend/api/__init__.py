@@ -1 +1,8 @@
 # FastAPI backend API package
+import sys
+from pathlib import Path
+
+# The optional forecast stream imports its pipeline modules from ml/ when it's deployed alongside
+ML_DIR = Path(__file__).parent.parent.parent / "ml"
+if str(ML_DIR) not in sys.path:
+    sys.path.insert(0, str(ML_DIR))
@@ -0,0 +1,39 @@
+import json
+from pathlib import Path
+import pandas as pd
+from sp500_telemetry import counter
+
+CACHE_REQUESTS = counter("artifact_cache_requests_total", "Artifact loads by cache result.")
+
+# path -> (mtime_ns, parsed content); entries are refreshed when the file changes
+_cache = {}
+
+def _load(path: Path, parse):
+    path = Path(path)
+    mtime = path.stat().st_mtime_ns  # raises FileNotFoundError like open()
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        CACHE_REQUESTS.inc(result="hit", artifact=path.name)
+        return cached[1]
+    CACHE_REQUESTS.inc(result="miss", artifact=path.name)
+    value = parse(path)
+    _cache[path] = (mtime, value)
+    return value
+
+def _read_json(path: Path):
+    with open(path) as f:
+        return json.load(f)
+
+def _read_csv_records(path: Path) -> list:
+    return pd.read_csv(path).to_dict(orient="records")
+
+def load_json(path: Path):
+    """Load a JSON artifact, reusing the parsed copy until the file changes."""
+    return _load(path, _read_json)
+
+def load_csv_records(path: Path) -> list:
+    """Load a CSV artifact as a list of records, cached like ``load_json``."""
+    return _load(path, _read_csv_records)
+
+def clear():
+    _cache.clear()
@@ -0,0 +1,61 @@
+import time
+from sp500_telemetry import gauge, histogram, is_enabled
+
+REQUEST_SECONDS = histogram("http_request_duration_seconds", "Request latency by route.")
+IN_FLIGHT = gauge("http_requests_in_flight", "Requests currently being served.")
+
+def route_template(scope) -> str:
+    """The matched route's path template, e.g. ``/api/data/equity-curve/{horizon}``."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    path = scope["path"]
+    if not hasattr(route, "path_regex"):
+        return route.path
+    # Newer FastAPI leaves the include_router() prefix off route.path; recover it
+    # as the part of the request path in front of what the route itself matches.
+    path_params = scope.get("path_params", {})
+    for i, char in enumerate(path):
+        if char != "/":
+            continue
+        match = route.path_regex.match(path[i:])
+        if match and all(
+            path_params.get(name) == route.param_convertors[name].convert(value)
+            for name, value in match.groupdict().items()
+        ):
+            return path[:i] + route.path
+    return route.path
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency and in-flight requests.
+
+    Passes requests straight through when instrumentation is disabled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route_template(scope),
+                status=status["code"],
+            )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
-import pandas as pd
 from pathlib import Path
+from api.artifacts import load_csv_records, load_json
 
 router = APIRouter()
 MODELS_DIR = Path(__file__).parent.parent.parent / "models"
@@ -11,8 +11,7 @@ def get_equity_curve(horizon: int):
     if horizon not in [1, 5, 20]:
         raise HTTPException(status_code=400, detail="Invalid horizon")
     try:
-        df = pd.read_csv(MODELS_DIR / f"equity_curve_{horizon}d.csv")
-        return {"horizon": horizon, "data": df.to_dict(orient="records")}
+        return {"horizon": horizon, "data": load_csv_records(MODELS_DIR / f"equity_curve_{horizon}d.csv")}
     except FileNotFoundError:
         return {"horizon": horizon, "data": []}
 
@@ -20,8 +19,6 @@ def get_equity_curve(horizon: int):
 def get_summary():
     """Get backtest summary for all horizons."""
     try:
-        with open(MODELS_DIR / "backtest_summary.json") as f:
-            import json
-            return json.load(f)
+        return load_json(MODELS_DIR / "backtest_summary.json")
     except FileNotFoundError:
         return {}
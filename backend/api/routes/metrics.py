@@ -1,6 +1,6 @@
 from fastapi import APIRouter
-import json
 from pathlib import Path
+from api.artifacts import load_json
 
 router = APIRouter()
 MODELS_DIR = Path(__file__).parent.parent.parent / "models"
@@ -11,11 +11,9 @@ def get_metrics():
     all_metrics = {}
     for horizon in [1, 5, 20]:
         try:
-            with open(MODELS_DIR / f"metrics_{horizon}d.json") as f:
-                all_metrics[f"{horizon}d"] = json.load(f)
-            with open(MODELS_DIR / f"backtest_{horizon}d.json") as f:
-                backtest = json.load(f)
-                all_metrics[f"{horizon}d"]["backtest"] = backtest
+            all_metrics[f"{horizon}d"] = dict(load_json(MODELS_DIR / f"metrics_{horizon}d.json"))
+            backtest = load_json(MODELS_DIR / f"backtest_{horizon}d.json")
+            all_metrics[f"{horizon}d"]["backtest"] = backtest
         except FileNotFoundError:
             pass
     return {"metrics": all_metrics}
@@ -24,7 +22,6 @@ def get_metrics():
 def get_feature_importance(horizon: int):
     """Get feature importance for a specific horizon."""
     try:
-        with open(MODELS_DIR / f"feature_importance_{horizon}d.json") as f:
-            return {"horizon": horizon, "features": json.load(f)}
+        return {"horizon": horizon, "features": load_json(MODELS_DIR / f"feature_importance_{horizon}d.json")}
     except FileNotFoundError:
         return {"horizon": horizon, "features": {}}
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException
 import joblib
-import json
 from pathlib import Path
+from api.artifacts import load_json
 
 router = APIRouter()
 MODELS_DIR = Path(__file__).parent.parent.parent / "models"
@@ -12,10 +12,8 @@ def get_predictions():
     predictions = {}
     for horizon in [1, 5, 20]:
         try:
-            with open(MODELS_DIR / f"backtest_{horizon}d.json") as f:
-                backtest = json.load(f)
-            with open(MODELS_DIR / f"metrics_{horizon}d.json") as f:
-                metrics = json.load(f)
+            backtest = load_json(MODELS_DIR / f"backtest_{horizon}d.json")
+            metrics = load_json(MODELS_DIR / f"metrics_{horizon}d.json")
             predictions[f"{horizon}d"] = {
                 "horizon_days": horizon,
                 "directional_accuracy": backtest["directional_accuracy"],
@@ -33,7 +31,6 @@ def get_prediction_by_horizon(horizon: int):
     if horizon not in [1, 5, 20]:
         raise HTTPException(status_code=400, detail="Invalid horizon. Use 1, 5, or 20.")
     try:
-        with open(MODELS_DIR / f"backtest_{horizon}d.json") as f:
-            return json.load(f)
+        return load_json(MODELS_DIR / f"backtest_{horizon}d.json")
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"No data for {horizon}d horizon")
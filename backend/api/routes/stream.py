@@ -0,0 +1,151 @@
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+import asyncio
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from . import data, metrics, predictions
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+MODELS_DIR = Path(__file__).parent.parent.parent / "models"
+KEEPALIVE_SECONDS = 15
+
+class ForecastBroadcaster:
+    """Fans forecast events out to every connected SSE/WebSocket client."""
+
+    def __init__(self):
+        self.latest = None
+        self._subscribers = set()
+        self._loop = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=100)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _deliver(self, event: dict):
+        self.latest = event
+        for queue in list(self._subscribers):
+            if queue.full():
+                queue.get_nowait()  # drop the oldest event for slow clients
+            queue.put_nowait(event)
+
+    def publish(self, event: dict):
+        """Publish an event; safe to call from the consumer thread."""
+        if self._loop is None:
+            self._deliver(event)
+        else:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+
+broadcaster = ForecastBroadcaster()
+_consumer = {}
+
+def dashboard_snapshot(horizon: int = 5) -> dict:
+    """Everything the dashboard used to poll from five separate endpoints."""
+    return {
+        "metrics": metrics.get_metrics()["metrics"],
+        "predictions": predictions.get_predictions()["predictions"],
+        "equity_curve": data.get_equity_curve(horizon)["data"],
+        "features": metrics.get_feature_importance(horizon)["features"],
+        "summary": data.get_summary(),
+        "latest_forecast": broadcaster.latest,
+    }
+
+def start_consumer(source_spec: str = None):
+    """Start the bar consumer thread if ``STREAM_SOURCE`` (or ``source_spec``) is set."""
+    source_spec = source_spec or os.getenv("STREAM_SOURCE")
+    if not source_spec or _consumer:
+        return
+    try:
+        from streaming import StreamingForecaster, consume, load_history, make_source
+
+        forecaster = StreamingForecaster(MODELS_DIR)
+        forecaster.warm_up(load_history(os.getenv("STREAM_HISTORY")))
+        source = make_source(source_spec)
+    except Exception:
+        # Streaming is optional; keep serving the rest of the API without it
+        logger.exception("Could not start the forecast stream from %s", source_spec)
+        return
+
+    broadcaster.bind(asyncio.get_running_loop())
+    thread = threading.Thread(
+        target=consume, args=(source, forecaster, broadcaster.publish), daemon=True
+    )
+    thread.start()
+    _consumer.update(source=source, thread=thread)
+
+def stop_consumer():
+    """Ask the bar source to stop; the daemon thread exits with it."""
+    source = _consumer.pop("source", None)
+    _consumer.clear()
+    if source is not None:
+        source.close()
+
+def _sse(event: str, payload) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@router.get("/forecasts")
+async def stream_forecasts(request: Request, horizon: int = 5):
+    """Server-sent events: one dashboard snapshot, then a forecast per new bar."""
+    if horizon not in [1, 5, 20]:
+        raise HTTPException(status_code=400, detail="Invalid horizon")
+    queue = broadcaster.subscribe()
+
+    async def events():
+        try:
+            yield _sse("snapshot", dashboard_snapshot(horizon))
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse("forecast", event)
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/ws")
+async def forecasts_ws(websocket: WebSocket, horizon: int = 5):
+    """WebSocket variant of the forecast stream."""
+    if horizon not in [1, 5, 20]:
+        raise HTTPException(status_code=400, detail="Invalid horizon")  # sent as an HTTP denial
+    await websocket.accept()
+    queue = broadcaster.subscribe()
+
+    async def forward():
+        while True:
+            event = await queue.get()
+            await websocket.send_json({"event": "forecast", "data": event})
+
+    sender = None
+    try:
+        await websocket.send_json({"event": "snapshot", "data": dashboard_snapshot(horizon)})
+        sender = asyncio.create_task(forward())
+        # Clients only listen; receiving is how a close is noticed between forecasts
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if sender is not None:
+            sender.cancel()
+        broadcaster.unsubscribe(queue)
+
+@router.get("/latest")
+def get_latest_forecast():
+    """Most recent streamed forecast, or null before the first bar arrives."""
+    return {"forecast": broadcaster.latest}
@@ -1,11 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import predictions, metrics, data
+from fastapi.responses import PlainTextResponse
+from api.middleware import MetricsMiddleware
+from api.routes import predictions, metrics, data, stream
+import sp500_telemetry as telemetry
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stream.start_consumer()
+    yield
+    stream.stop_consumer()
 
 app = FastAPI(
     title="S&P 500 Forecasting API",
     description="API for S&P 500 multi-horizon price prediction",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -15,10 +26,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(predictions.router, prefix="/api/predictions", tags=["predictions"])
 app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
 app.include_router(data.router, prefix="/api/data", tags=["data"])
+app.include_router(stream.router, prefix="/api/stream", tags=["stream"])
 
 @app.get("/")
 def root():
@@ -27,3 +40,19 @@ def root():
 @app.get("/api/health")
 def health_check():
     return {"status": "healthy", "version": "1.0.0"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus text exposition of request and pipeline metrics."""
+    return PlainTextResponse(
+        telemetry.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+@app.get("/metrics/json")
+def metrics_json():
+    """Structured view of the same metrics plus the pipeline run log."""
+    return {
+        "enabled": telemetry.is_enabled(),
+        "metrics": telemetry.snapshot(),
+        "spans": telemetry.run_log(),
+    }
@@ -0,0 +1,165 @@
+"""Process-wide metric registry shared by the API and the ML pipeline.
+
+Kept dependency-free and outside the ``api`` package so the API runs without
+``ml/`` and ``ml/instrumentation.py`` can import it without importing the app.
+Pipeline spans are recorded here too.
+"""
+import json
+import os
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+_state = {"enabled": os.getenv("INSTRUMENTATION", "").lower() in ("1", "true", "yes")}
+_lock = threading.Lock()
+_registry = {}
+_run_log = []
+
+def configure(enabled: bool = True):
+    """Turn metric collection on or off."""
+    _state["enabled"] = enabled
+
+def is_enabled() -> bool:
+    return _state["enabled"]
+
+def reset():
+    """Clear all recorded metrics and spans."""
+    with _lock:
+        for metric in _registry.values():
+            metric.values.clear()
+        _run_log.clear()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values = {}
+
+    @staticmethod
+    def _key(labels: dict) -> tuple:
+        return tuple(sorted(labels.items()))
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if not _state["enabled"]:
+            return
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        if not _state["enabled"]:
+            return
+        with _lock:
+            self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        if not _state["enabled"]:
+            return
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        if not _state["enabled"]:
+            return
+        key = self._key(labels)
+        with _lock:
+            data = self.values.get(key)
+            if data is None:
+                data = self.values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data["buckets"][i] += 1
+            data["sum"] += value
+            data["count"] += 1
+
+
+def _get_or_create(cls, name: str, help: str, **kwargs):
+    with _lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, help, **kwargs)
+    return metric
+
+def counter(name: str, help: str = "") -> Counter:
+    return _get_or_create(Counter, name, help)
+
+def gauge(name: str, help: str = "") -> Gauge:
+    return _get_or_create(Gauge, name, help)
+
+def histogram(name: str, help: str = "", buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+    return _get_or_create(Histogram, name, help, buckets=buckets)
+
+
+def record_span(record: dict):
+    """Append a completed pipeline span to the run log."""
+    with _lock:
+        _run_log.append(record)
+
+def run_log() -> list:
+    """Completed spans in the order they finished."""
+    with _lock:
+        return list(_run_log)
+
+def _escape(value) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: tuple, extra: dict = None) -> str:
+    items = list(key) + list((extra or {}).items())
+    if not items:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in items)
+    return "{" + body + "}"
+
+def render_prometheus() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        metrics = list(_registry.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, value in metric.values.items():
+                if metric.kind != "histogram":
+                    lines.append(f"{metric.name}{_format_labels(key)} {value}")
+                    continue
+                for bound, count in zip(metric.buckets, value["buckets"]):
+                    lines.append(f"{metric.name}_bucket{_format_labels(key, {'le': bound})} {count}")
+                lines.append(f"{metric.name}_bucket{_format_labels(key, {'le': '+Inf'})} {value['count']}")
+                lines.append(f"{metric.name}_sum{_format_labels(key)} {value['sum']}")
+                lines.append(f"{metric.name}_count{_format_labels(key)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+def snapshot() -> dict:
+    """JSON-friendly view of every registered metric."""
+    out = {}
+    with _lock:
+        for metric in _registry.values():
+            out[metric.name] = [
+                {"labels": dict(key), "value": json.loads(json.dumps(value))}
+                for key, value in metric.values.items()
+            ]
+    return out
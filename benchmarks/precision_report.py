@@ -0,0 +1,134 @@
+"""Accuracy-versus-memory report for the float32 feature path.
+
+Runs feature generation, training and backtesting on the same synthetic data
+once per dtype and reports how far the float32 forecasts drift from float64
+alongside the peak traced memory of each stage.
+
+    python benchmarks/precision_report.py --years 15 --symbols 7
+"""
+import argparse
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from run_benchmarks import synthetic_pipeline
+from config import HORIZONS
+
+DTYPES = ["float64", "float32"]
+MODELS = ["xgboost", "rf", "ridge"]
+
+
+def traced(func):
+    """Call ``func`` and return (result, peak traced bytes)."""
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def run_dtype(workdir: Path, years: int, symbols: int, dtype: str) -> dict:
+    """Run the pipeline with ``dtype`` and collect forecasts, metrics and memory."""
+    import backtest
+    import data_collection
+    import feature_engineering
+    import train_models
+
+    out = {"memory": {}, "horizons": {}}
+    with synthetic_pipeline(workdir, years, symbols):
+        data_collection.fetch_all_data()
+        df, out["memory"]["create_features"] = traced(lambda: feature_engineering.create_features(dtype=dtype))
+        feature_cols = [c for c in df.columns if not c.startswith("target_")]
+        out["feature_matrix_bytes"] = int(df[feature_cols].memory_usage(index=False).sum())
+        for h in HORIZONS:
+            results, train_peak = traced(lambda: train_models.train_all_models(h, dtype=dtype))
+            bt, backtest_peak = traced(lambda: backtest.run_backtest(h, dtype=dtype))
+            out["memory"][f"train_all_models_{h}d"] = train_peak
+            out["memory"][f"run_backtest_{h}d"] = backtest_peak
+            out["horizons"][h] = {
+                "preds": np.mean([results[m]["preds"] for m in MODELS], axis=0),
+                "model_preds": {m: results[m]["preds"] for m in MODELS},
+                "mae": float(results["ensemble"]["mae"]),
+                "backtest": bt,
+            }
+    return out
+
+
+def drift(p64: np.ndarray, p32: np.ndarray) -> dict:
+    """How far one model's float32 forecasts moved from float64."""
+    return {
+        "max_abs_prediction_diff": float(np.max(np.abs(p64 - p32))),
+        "sign_agreement": float(np.mean((p64 > 0) == (p32 > 0))),
+    }
+
+
+def build_report(years: int = 15, symbols: int = 7) -> dict:
+    runs = {}
+    for dtype in DTYPES:
+        with tempfile.TemporaryDirectory() as tmp:
+            runs[dtype] = run_dtype(Path(tmp), years, symbols, dtype)
+
+    base, lean = runs["float64"], runs["float32"]
+    accuracy = {}
+    for h in HORIZONS:
+        p64, p32 = base["horizons"][h]["preds"], lean["horizons"][h]["preds"]
+        bt64, bt32 = base["horizons"][h]["backtest"], lean["horizons"][h]["backtest"]
+        accuracy[f"{h}d"] = {
+            "max_abs_prediction_diff": float(np.max(np.abs(p64 - p32))),
+            "prediction_correlation": float(np.corrcoef(p64, p32)[0, 1]),
+            "sign_agreement": float(np.mean((p64 > 0) == (p32 > 0))),
+            "ensemble_mae": {"float64": base["horizons"][h]["mae"], "float32": lean["horizons"][h]["mae"]},
+            "directional_accuracy": {"float64": bt64["directional_accuracy"], "float32": bt32["directional_accuracy"]},
+            "sharpe_ratio": {"float64": bt64["sharpe_ratio"], "float32": bt32["sharpe_ratio"]},
+            "models": {m: drift(base["horizons"][h]["model_preds"][m], lean["horizons"][h]["model_preds"][m])
+                       for m in MODELS},
+        }
+    memory = {
+        stage: {
+            "float64": base["memory"][stage],
+            "float32": lean["memory"][stage],
+            "ratio": lean["memory"][stage] / base["memory"][stage],
+        }
+        for stage in base["memory"]
+    }
+    memory["feature_matrix"] = {
+        "float64": base["feature_matrix_bytes"],
+        "float32": lean["feature_matrix_bytes"],
+        "ratio": lean["feature_matrix_bytes"] / base["feature_matrix_bytes"],
+    }
+    return {"config": {"years": years, "symbols": symbols}, "accuracy": accuracy, "peak_memory_bytes": memory}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=15)
+    parser.add_argument("--symbols", type=int, default=7)
+    parser.add_argument("--output", type=Path, default=Path(__file__).parent / "precision_report.json")
+    args = parser.parse_args(argv)
+
+    report = build_report(args.years, args.symbols)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'horizon':8} {'max |diff|':>12} {'corr':>8} {'sign agree':>11} {'dir acc 64/32':>16}")
+    for h, acc in report["accuracy"].items():
+        da = acc["directional_accuracy"]
+        print(f"{h:8} {acc['max_abs_prediction_diff']:>12.2e} {acc['prediction_correlation']:>8.4f} "
+              f"{acc['sign_agreement']:>11.1%} {da['float64']:>7.1%}/{da['float32']:.1%}")
+        for m, d in acc["models"].items():
+            print(f"  {m:6} {d['max_abs_prediction_diff']:>12.2e} {'':>8} {d['sign_agreement']:>11.1%}")
+    print(f"\n{'stage':28} {'float64 MB':>11} {'float32 MB':>11} {'ratio':>7}")
+    for stage, mem in report["peak_memory_bytes"].items():
+        print(f"{stage:28} {mem['float64'] / 1e6:>11.1f} {mem['float32'] / 1e6:>11.1f} {mem['ratio']:>7.2f}")
+    print(f"\nReport saved to: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+"""Offline benchmark suite for the ML pipeline and API routes.
+
+Runs every pipeline stage on synthetic OHLCV data of configurable size,
+load-tests each backend route, writes the results as JSON and compares them
+against a stored baseline. The SSE and WebSocket forecast streams are timed
+to their first ``snapshot`` event.
+
+    python benchmarks/run_benchmarks.py --years 15 --symbols 7
+    python benchmarks/run_benchmarks.py --years 100 --symbols 500 --output big.json
+    python benchmarks/run_benchmarks.py --save-baseline   # refresh baseline.json
+
+The stored baseline is machine-specific; refresh it on the box that runs the
+comparison. Runs are only compared when their size settings match.
+
+Exits with status 1 when any benchmark is slower (or uses more memory) than
+the baseline by more than ``--threshold`` and its section's noise floor, or
+when a route returns more errors than it did in the baseline. ``peak_alloc_bytes`` comes from
+tracemalloc and covers Python and NumPy allocations; memory held by the native
+XGBoost/scikit-learn code only shows up in RSS. ``peak_rss_bytes`` is the
+highest process RSS sampled while a benchmark's timed runs executed, and
+``rss_increase_bytes`` is how far it rose above the RSS at their start.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "ml"))
+sys.path.insert(0, str(ROOT / "backend"))
+
+import instrumentation
+from config import HORIZONS, TICKERS
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCH_DIR / "results.json"
+ROUTES = [
+    "/",
+    "/api/health",
+    "/api/predictions/",
+    "/api/predictions/5",
+    "/api/metrics/",
+    "/api/metrics/feature-importance/5",
+    "/api/data/equity-curve/5",
+    "/api/data/summary",
+    "/api/stream/latest",
+    "/api/stream/forecasts",
+    "/api/stream/ws",
+    "/metrics",
+    "/metrics/json",
+]
+
+
+def make_tickers(symbols: int) -> dict:
+    """The configured tickers, padded with synthetic symbols up to ``symbols``."""
+    tickers = dict(list(TICKERS.items())[:symbols])
+    for i in range(len(tickers), symbols):
+        tickers[f"sym{i:03d}"] = f"SYM{i:03d}"
+    return tickers
+
+
+def make_ohlcv(years: int, tickers: dict, seed: int = 42) -> dict:
+    """Synthetic yfinance-shaped OHLCV frames keyed by ticker symbol."""
+    rng = np.random.default_rng(seed)
+    n = years * 252
+    dates = pd.bdate_range("1990-01-01", periods=n)
+    frames = {}
+    for ticker in tickers.values():
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, n)))
+        spread = rng.uniform(0, 0.01, n)
+        frames[ticker] = pd.DataFrame({
+            "Close": close,
+            "High": close * (1 + spread),
+            "Low": close * (1 - spread),
+            "Open": close * (1 + rng.normal(0, 0.002, n)),
+            "Volume": rng.uniform(1e6, 1e9, n),
+        }, index=dates)
+    return frames
+
+
+def measure(func, repeats: int = 1, memory: bool = True, number: int = 1) -> dict:
+    """Time ``number`` calls of ``func`` over ``repeats`` runs, then profile one extra call's memory."""
+    times = []
+    with instrumentation.sample_rss() as rss:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append(time.perf_counter() - start)
+    result = {
+        "seconds": min(times),
+        "median_seconds": statistics.median(times),
+        "repeats": repeats,
+    }
+    if number > 1:
+        result["calls"] = number
+        result["per_call_seconds"] = min(times) / number
+    # Sub-step breakdown from the last timed run's instrumentation spans
+    steps = {r["span"]: r["duration_s"] for r in instrumentation.run_log() if "." in r["span"]}
+    if steps:
+        result["steps"] = steps
+    if memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_alloc_bytes"] = peak
+    if rss.peak is not None:
+        result["peak_rss_bytes"] = rss.peak
+        result["rss_increase_bytes"] = rss.peak - rss.start
+    return result
+
+
+@contextlib.contextmanager
+def synthetic_pipeline(workdir: Path, years: int, symbols: int):
+    """Point every pipeline module at ``workdir`` and serve synthetic bars to yfinance.
+
+    Yields the models directory; pipeline stdout is suppressed.
+    """
+    raw_dir, processed_dir, models_dir = workdir / "raw", workdir / "processed", workdir / "models"
+    for d in (raw_dir, processed_dir, models_dir):
+        d.mkdir(parents=True, exist_ok=True)
+
+    tickers = make_tickers(symbols)
+    frames = make_ohlcv(years, tickers)
+    patches = [
+        patch("data_collection.yf.download", side_effect=lambda ticker, **kw: frames[ticker].copy()),
+        patch("data_collection.TICKERS", tickers),
+        patch("data_collection.RAW_DIR", raw_dir),
+        patch("feature_engineering.RAW_DIR", raw_dir),
+        patch("feature_engineering.PROCESSED_DIR", processed_dir),
+        patch("train_models.PROCESSED_DIR", processed_dir),
+        patch("train_models.MODELS_DIR", models_dir),
+        patch("backtest.PROCESSED_DIR", processed_dir),
+        patch("backtest.MODELS_DIR", models_dir),
+    ]
+    with contextlib.ExitStack() as stack:
+        for p in patches:
+            stack.enter_context(p)
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        yield models_dir
+
+
+def bench_pipeline(workdir: Path, years: int, symbols: int, repeats: int, memory: bool) -> dict:
+    """Benchmark every pipeline stage against synthetic data in ``workdir``."""
+    import backtest
+    import data_collection
+    import feature_engineering
+    import train_models
+
+    stages = [
+        ("fetch_all_data", data_collection.fetch_all_data),
+        ("create_features", feature_engineering.create_features),
+    ]
+    for h in HORIZONS:
+        stages.append((f"train_all_models_{h}d", lambda h=h: train_models.train_all_models(h)))
+    for h in HORIZONS:
+        stages.append((f"run_backtest_{h}d", lambda h=h: backtest.run_backtest(h)))
+
+    results = {}
+    with synthetic_pipeline(workdir, years, symbols) as models_dir:
+        for name, func in stages:
+            instrumentation.reset()
+            results[name] = measure(func, repeats, memory)
+
+        summary = {f"{h}d": backtest.run_backtest(h) for h in HORIZONS}
+    with open(models_dir / "backtest_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    features_path = workdir / "processed" / "features.csv"
+    results["_data"] = {
+        "rows": len(pd.read_csv(features_path, usecols=[0])),
+        "columns": len(pd.read_csv(features_path, nrows=0).columns),
+    }
+    return results
+
+
+def bench_metric_functions(rows: int, repeats: int) -> dict:
+    """Benchmark the backtest and training metric helpers on ``rows`` samples."""
+    from backtest import calculate_max_drawdown, calculate_sharpe, calculate_sortino
+    from train_models import calculate_directional_accuracy
+
+    rng = np.random.default_rng(0)
+    returns = pd.Series(rng.normal(0.0003, 0.01, rows))
+    cumulative = (1 + returns).cumprod()
+    preds = rng.normal(0, 0.01, rows)
+    funcs = {
+        "calculate_sharpe": lambda: calculate_sharpe(returns),
+        "calculate_sortino": lambda: calculate_sortino(returns),
+        "calculate_max_drawdown": lambda: calculate_max_drawdown(cumulative),
+        "calculate_directional_accuracy": lambda: calculate_directional_accuracy(returns.values, preds),
+    }
+    return {name: measure(func, repeats, memory=True, number=1000) for name, func in funcs.items()}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _fetch(url: str) -> bool:
+    """GET ``url`` and read the whole response."""
+    with urllib.request.urlopen(url, timeout=30) as response:
+        response.read()
+        return response.status < 400
+
+
+def _sse_snapshot(url: str) -> bool:
+    """Open the SSE stream and read until its first ``snapshot`` event has arrived."""
+    with urllib.request.urlopen(url, timeout=30) as response:
+        for line in response:
+            if line.startswith(b"event: snapshot"):
+                return response.readline().startswith(b"data: ")
+    return False
+
+
+def _ws_snapshot(url: str) -> bool:
+    """Open the WebSocket stream and wait for its first message, the snapshot."""
+    from websockets.sync.client import connect
+
+    with connect(url.replace("http://", "ws://", 1), open_timeout=30) as ws:
+        return json.loads(ws.recv(timeout=30))["event"] == "snapshot"
+
+
+# Streams never finish, so they are timed to their first event instead
+STREAM_PROBES = {"/api/stream/forecasts": _sse_snapshot, "/api/stream/ws": _ws_snapshot}
+
+
+def bench_routes(models_dir: Path, concurrency: int, requests: int) -> dict:
+    """Load-test each API route with ``concurrency`` parallel clients.
+
+    The forecast streams are timed from connecting to receiving the ``snapshot`` event.
+    """
+    import uvicorn
+    from api import artifacts
+    from api.routes import data, metrics, predictions, stream
+    from main import app
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    results = {}
+    with contextlib.ExitStack() as stack:
+        for module in (data, metrics, predictions, stream):
+            stack.enter_context(patch.object(module, "MODELS_DIR", models_dir))
+        artifacts.clear()
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        deadline = time.time() + 30
+        while not server.started:
+            if not thread.is_alive() or time.time() > deadline:
+                raise RuntimeError("API server failed to start")
+            time.sleep(0.05)
+
+        def hit(route):
+            probe = STREAM_PROBES.get(route, _fetch)
+            start = time.perf_counter()
+            try:
+                ok = probe(f"http://127.0.0.1:{port}{route}")
+            except Exception:
+                ok = False
+            return time.perf_counter() - start, ok
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for route in ROUTES:
+                hit(route)  # warm the artifact cache
+                start = time.perf_counter()
+                samples = list(pool.map(hit, [route] * requests))
+                elapsed = time.perf_counter() - start
+                latencies = sorted(s for s, _ in samples)
+                results[route] = {
+                    "seconds": float(np.percentile(latencies, 50)),
+                    "p95_seconds": float(np.percentile(latencies, 95)),
+                    "p99_seconds": float(np.percentile(latencies, 99)),
+                    "requests_per_second": requests / elapsed,
+                    "errors": sum(not ok for _, ok in samples),
+                }
+        server.should_exit = True
+        thread.join(timeout=10)
+    return results
+
+
+# Absolute changes below these are treated as noise regardless of ratio. Routes
+# answer in ~10 ms, so they need a far tighter floor than pipeline stages.
+MIN_DELTA = {
+    "pipeline": {"seconds": 0.05, "peak_alloc_bytes": 1_000_000, "rss_increase_bytes": 50_000_000},
+    "metric_functions": {"seconds": 0.01, "peak_alloc_bytes": 50_000},
+    "routes": {"seconds": 0.01},
+}
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> list:
+    """List benchmarks whose time or peak memory regressed past ``threshold``, or that gained errors."""
+    regressions = []
+    for section, benches in results["benchmarks"].items():
+        for name, current in benches.items():
+            previous = baseline.get("benchmarks", {}).get(section, {}).get(name)
+            if not previous or name.startswith("_"):
+                continue
+            for key, min_delta in MIN_DELTA.get(section, {}).items():
+                if key not in current or not previous.get(key):
+                    continue
+                ratio = current[key] / previous[key]
+                if ratio > 1 + threshold and current[key] - previous[key] > min_delta:
+                    regressions.append({
+                        "benchmark": f"{section}.{name}",
+                        "metric": key,
+                        "baseline": previous[key],
+                        "current": current[key],
+                        "ratio": ratio,
+                    })
+            if current.get("errors", 0) > previous.get("errors", 0):
+                regressions.append({
+                    "benchmark": f"{section}.{name}",
+                    "metric": "errors",
+                    "baseline": previous.get("errors", 0),
+                    "current": current["errors"],
+                    "ratio": None,
+                })
+    return regressions
+
+
+def run(years: int = 15, symbols: int = 7, repeats: int = 3, concurrency: int = 8,
+        requests: int = 200, memory: bool = True, routes: bool = True) -> dict:
+    """Run the full suite and return the results document."""
+    instrumentation.configure(enabled=True)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            benchmarks = {"pipeline": bench_pipeline(workdir, years, symbols, repeats, memory)}
+            benchmarks["metric_functions"] = bench_metric_functions(years * 252, repeats)
+            if routes:
+                benchmarks["routes"] = bench_routes(workdir / "models", concurrency, requests)
+    finally:
+        instrumentation.configure(enabled=False)
+        instrumentation.reset()
+    return {
+        "config": {
+            "years": years, "symbols": symbols, "repeats": repeats,
+            "concurrency": concurrency, "requests": requests,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=15, help="years of daily bars")
+    parser.add_argument("--symbols", type=int, default=len(TICKERS), help="number of symbols")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per stage")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel API clients")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed slowdown vs baseline")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc profiling")
+    parser.add_argument("--no-routes", action="store_true", help="skip the API load test")
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.years, args.symbols, args.repeats, args.concurrency, args.requests,
+        memory=not args.no_memory, routes=not args.no_routes,
+    )
+
+    regressions = []
+    if args.baseline.exists() and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print(f"Baseline config {baseline.get('config')} differs from this run; skipping comparison")
+        else:
+            regressions = compare_to_baseline(results, baseline, args.threshold)
+    results["regressions"] = regressions
+
+    output = args.baseline if args.save_baseline else args.output
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'benchmark':50} {'seconds':>10} {'peak MB':>10} {'+RSS MB':>10}")
+    print("-" * 83)
+    for section, benches in results["benchmarks"].items():
+        for name, data in benches.items():
+            if name.startswith("_"):
+                continue
+            peak = data.get("peak_alloc_bytes")
+            peak_str = f"{peak / 1e6:>10.1f}" if peak is not None else f"{'-':>10}"
+            rss = data.get("rss_increase_bytes")
+            rss_str = f"{rss / 1e6:>10.1f}" if rss is not None else f"{'-':>10}"
+            print(f"{section + '.' + name:50} {data['seconds']:>10.4f} {peak_str} {rss_str}")
+    print(f"\nResults saved to: {output}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for r in regressions:
+            ratio = f" ({r['ratio']:.2f}x)" if r["ratio"] is not None else ""
+            print(f"  {r['benchmark']} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g}{ratio}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+'use client';
+
+import { useEffect, useState, type ComponentProps } from "react";
+import { subscribeForecasts, type ForecastEvent } from "@/lib/api";
+import { PredictionPanel } from "./PredictionPanel";
+import { EquityChart } from "./EquityChart";
+import { MetricsTable } from "./MetricsTable";
+import { BacktestSummary } from "./BacktestSummary";
+import { FeatureImportance } from "./FeatureImportance";
+import { BarChart3, Activity } from "lucide-react";
+
+const HORIZON = 5;
+
+// Payload of the stream's `snapshot` event (see backend/api/routes/stream.py)
+interface DashboardSnapshot {
+  metrics: ComponentProps<typeof MetricsTable>["metrics"];
+  predictions: ComponentProps<typeof PredictionPanel>["predictions"];
+  equity_curve: ComponentProps<typeof EquityChart>["data"];
+  features: ComponentProps<typeof FeatureImportance>["features"];
+  summary: ComponentProps<typeof BacktestSummary>["data"];
+  latest_forecast: ForecastEvent | null;
+}
+
+export function Dashboard() {
+  const [snapshot, setSnapshot] = useState<DashboardSnapshot | null>(null);
+  const [forecast, setForecast] = useState<ForecastEvent | null>(null);
+
+  useEffect(() => subscribeForecasts<DashboardSnapshot>(
+    (data) => {
+      setSnapshot(data);
+      setForecast(data.latest_forecast);
+    },
+    setForecast,
+    HORIZON,
+  ), []);
+
+  if (!snapshot) {
+    return (
+      <div className="flex flex-col items-center justify-center py-20 text-gray-500">
+        <Activity className="w-16 h-16 mb-4 text-zinc-700 animate-pulse" />
+        <p className="text-sm">Connecting to the forecast stream...</p>
+      </div>
+    );
+  }
+
+  const { metrics, predictions, equity_curve, features, summary } = snapshot;
+  const hasData = Object.values(predictions).some(Boolean);
+
+  if (!hasData) {
+    return (
+      <div className="flex flex-col items-center justify-center py-20 text-gray-500">
+        <BarChart3 className="w-16 h-16 mb-4 text-zinc-700" />
+        <h2 className="text-xl font-semibold mb-2">No Data Available</h2>
+        <p className="text-sm">Run the ML pipeline to generate predictions and metrics.</p>
+        <code className="mt-4 px-4 py-2 bg-zinc-900 rounded text-sm text-orange-500">
+          python -m ml.data_collection && python -m ml.feature_engineering && python -m ml.train_models && python -m ml.backtest
+        </code>
+      </div>
+    );
+  }
+
+  return (
+    <div className="grid grid-cols-3 gap-4">
+      {/* Row 1: Predictions */}
+      <div className="col-span-3">
+        <PredictionPanel predictions={predictions} forecast={forecast} />
+      </div>
+
+      {/* Row 2: Equity Chart + Feature Importance */}
+      <EquityChart data={equity_curve} horizon={HORIZON} />
+      <FeatureImportance features={features} horizon={HORIZON} />
+
+      {/* Row 3: Backtest Summary */}
+      <div className="col-span-3">
+        <BacktestSummary data={summary} />
+      </div>
+
+      {/* Row 4: Model Comparison Table */}
+      <MetricsTable metrics={metrics} />
+    </div>
+  );
+}
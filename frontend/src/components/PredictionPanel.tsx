@@ -3,6 +3,7 @@
 import { Card } from "./ui/Card";
 import { MetricBadge } from "./ui/MetricBadge";
 import { TrendingUp, TrendingDown, Minus, Activity } from "lucide-react";
+import type { ForecastEvent } from "@/lib/api";
 
 interface PredictionData {
   horizon_days: number;
@@ -13,6 +14,7 @@ interface PredictionData {
 
 interface PredictionPanelProps {
   predictions: Record<string, PredictionData | null>;
+  forecast?: ForecastEvent | null;
 }
 
 // Tooltip explanations
@@ -20,9 +22,10 @@ const TOOLTIPS = {
   directional_accuracy: "Percentage of times the model correctly predicted whether the market would go up or down. >50% means better than random.",
   sharpe_ratio: "Risk-adjusted return. Measures excess return per unit of risk. >1 is good, >2 is excellent, <0 means losing money.",
   total_return: "Cumulative return of the trading strategy during the backtest period. Positive = profit, negative = loss.",
+  forecast: "Ensemble forecast of the return over this horizon, pushed by the backend as each new bar arrives.",
 };
 
-export function PredictionPanel({ predictions }: PredictionPanelProps) {
+export function PredictionPanel({ predictions, forecast }: PredictionPanelProps) {
   const horizons = ['1d', '5d', '20d'];
 
   const getTrend = (value: number) => {
@@ -45,6 +48,7 @@ export function PredictionPanel({ predictions }: PredictionPanelProps) {
       <div className="grid grid-cols-3 gap-4">
         {horizons.map((horizon) => {
           const data = predictions[horizon];
+          const live = forecast?.forecasts[horizon];
           if (!data) return (
             <div key={horizon} className="text-gray-500 text-center py-8 bg-zinc-800/30 rounded-lg border border-zinc-700/50">
               <Activity className="w-8 h-8 mx-auto mb-2 opacity-30" />
@@ -100,6 +104,17 @@ export function PredictionPanel({ predictions }: PredictionPanelProps) {
                       tooltip={TOOLTIPS.total_return}
                     />
                   </div>
+                  {live && (
+                    <div className="pt-2 border-t border-zinc-700/50">
+                      <MetricBadge
+                        label={`Forecast from ${forecast?.date}`}
+                        value={formatPercent(live.prediction)}
+                        trend={getTrend(live.prediction)}
+                        size="md"
+                        tooltip={TOOLTIPS.forecast}
+                      />
+                    </div>
+                  )}
                 </div>
               </div>
             </div>
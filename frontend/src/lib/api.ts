@@ -1,31 +1,24 @@
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "https://sp500-forecasting-production.up.railway.app";
 
-export async function fetchMetrics() {
-  const res = await fetch(`${API_URL}/api/metrics`, { cache: 'no-store' });
-  if (!res.ok) throw new Error('Failed to fetch metrics');
-  return res.json();
+export interface ForecastEvent {
+  date: string;
+  forecasts: Record<string, {
+    horizon_days: number;
+    prediction: number;
+    model_predictions: Record<string, number>;
+  }>;
 }
 
-export async function fetchPredictions() {
-  const res = await fetch(`${API_URL}/api/predictions`, { cache: 'no-store' });
-  if (!res.ok) throw new Error('Failed to fetch predictions');
-  return res.json();
-}
-
-export async function fetchEquityCurve(horizon: number) {
-  const res = await fetch(`${API_URL}/api/data/equity-curve/${horizon}`, { cache: 'no-store' });
-  if (!res.ok) throw new Error('Failed to fetch equity curve');
-  return res.json();
-}
-
-export async function fetchFeatureImportance(horizon: number) {
-  const res = await fetch(`${API_URL}/api/metrics/feature-importance/${horizon}`, { cache: 'no-store' });
-  if (!res.ok) throw new Error('Failed to fetch feature importance');
-  return res.json();
-}
+export type StreamHandler<T> = (payload: T) => void;
 
-export async function fetchSummary() {
-  const res = await fetch(`${API_URL}/api/data/summary`, { cache: 'no-store' });
-  if (!res.ok) throw new Error('Failed to fetch summary');
-  return res.json();
+// The snapshot replaces the dashboard's endpoint fetches and is re-sent whenever EventSource reconnects
+export function subscribeForecasts<S>(
+  onSnapshot: StreamHandler<S>,
+  onForecast: StreamHandler<ForecastEvent>,
+  horizon: number = 5,
+) {
+  const source = new EventSource(`${API_URL}/api/stream/forecasts?horizon=${horizon}`);
+  source.addEventListener('snapshot', (e) => onSnapshot(JSON.parse((e as MessageEvent).data)));
+  source.addEventListener('forecast', (e) => onForecast(JSON.parse((e as MessageEvent).data)));
+  return () => source.close();
 }
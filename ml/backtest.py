@@ -2,10 +2,29 @@ import pandas as pd
 import numpy as np
 import joblib
 import json
+import hashlib
+import inspect
+import argparse
+import warnings
+from pathlib import Path
+import sklearn
+import xgboost
+from joblib import Parallel, cpu_count, delayed, effective_n_jobs
+from sklearn.preprocessing import StandardScaler
 try:
-    from .config import PROCESSED_DIR, MODELS_DIR, HORIZONS
+    from .config import PROCESSED_DIR, MODELS_DIR, HORIZONS, FEATURE_DTYPE
+    from .feature_engineering import load_features, load_scaled_features
+    from .instrumentation import span, timed
+    from .train_models import get_feature_cols, train_xgboost, train_rf, train_ridge
 except ImportError:
-    from config import PROCESSED_DIR, MODELS_DIR, HORIZONS
+    from config import PROCESSED_DIR, MODELS_DIR, HORIZONS, FEATURE_DTYPE
+    from feature_engineering import load_features, load_scaled_features
+    from instrumentation import span, timed
+    from train_models import get_feature_cols, train_xgboost, train_rf, train_ridge
+
+TRAINERS = {"xgboost": train_xgboost, "rf": train_rf, "ridge": train_ridge}
+THREADED = {"xgboost", "rf"}  # trainers that take an n_jobs thread count
+RETRAIN_EVERY = 21  # trading days; roughly the monthly redeploy cadence
 
 def calculate_sharpe(returns: pd.Series, risk_free: float = 0.02) -> float:
     """Calculate annualized Sharpe ratio."""
@@ -28,21 +47,26 @@ def calculate_sortino(returns: pd.Series, risk_free: float = 0.02) -> float:
         return 0.0
     return float(np.sqrt(252) * excess.mean() / downside)
 
-def run_backtest(horizon: int = 1, threshold: float = 0.001) -> dict:
+@timed("run_backtest")
+def run_backtest(horizon: int = 1, threshold: float = 0.001, dtype: str = None) -> dict:
     """Run backtest for a given horizon."""
-    df = pd.read_csv(PROCESSED_DIR / "features.csv", index_col=0, parse_dates=True)
+    dtype = np.dtype(dtype or FEATURE_DTYPE)
+    path = PROCESSED_DIR / "features.csv"
+    with span("load"):
+        df = load_features(path, columns=[f"target_{horizon}d"])  # features are parsed while scaling
 
-    feature_cols = joblib.load(MODELS_DIR / f"features_{horizon}d.pkl")
-    scaler = joblib.load(MODELS_DIR / f"scaler_{horizon}d.pkl")
+        feature_cols = joblib.load(MODELS_DIR / f"features_{horizon}d.pkl")
+        scaler = joblib.load(MODELS_DIR / f"scaler_{horizon}d.pkl")
 
-    # Load models
-    models = {
-        "xgboost": joblib.load(MODELS_DIR / f"xgboost_{horizon}d.pkl"),
-        "rf": joblib.load(MODELS_DIR / f"rf_{horizon}d.pkl"),
-        "ridge": joblib.load(MODELS_DIR / f"ridge_{horizon}d.pkl"),
-    }
+        # Load models
+        models = {
+            "xgboost": joblib.load(MODELS_DIR / f"xgboost_{horizon}d.pkl"),
+            "rf": joblib.load(MODELS_DIR / f"rf_{horizon}d.pkl"),
+            "ridge": joblib.load(MODELS_DIR / f"ridge_{horizon}d.pkl"),
+        }
 
     # Use last 20% for backtest
+    # Only the target column is carried along; returns are compounded in float64
     split_idx = int(len(df) * 0.8)
     test_df = df.iloc[split_idx:].copy()
 
@@ -52,14 +76,21 @@ def run_backtest(horizon: int = 1, threshold: float = 0.001) -> dict:
     print(f"Test size: {len(test_df)} days")
     print(f"{'='*50}")
 
-    X_test = scaler.transform(test_df[feature_cols].values)
+    with span("scale"):
+        X_test = load_scaled_features(path, feature_cols, scaler, len(df), rows=slice(split_idx, None), dtype=dtype)
 
     # Ensemble prediction (simple average)
-    predictions = np.zeros(len(test_df))
-    for name, model in models.items():
-        predictions += model.predict(X_test)
-    predictions /= len(models)
+    with span("predict"):
+        predictions = np.zeros(len(test_df))
+        for name, model in models.items():
+            predictions += model.predict(X_test)
+        predictions /= len(models)
+
+    return evaluate_predictions(test_df, predictions, horizon, threshold)
 
+def evaluate_predictions(test_df: pd.DataFrame, predictions: np.ndarray, horizon: int,
+                         threshold: float, extra: dict = None) -> dict:
+    """Trade the forecasts, score the strategy and write the backtest artifacts."""
     test_df["prediction"] = predictions
     test_df["actual_return"] = test_df[f"target_{horizon}d"]
 
@@ -95,6 +126,7 @@ def run_backtest(horizon: int = 1, threshold: float = 0.001) -> dict:
             ((test_df["prediction"] > 0) == (test_df["actual_return"] > 0)).mean()
         ),
     }
+    results.update(extra or {})
 
     # Print results
     print(f"\nBacktest Results:")
@@ -110,23 +142,163 @@ def run_backtest(horizon: int = 1, threshold: float = 0.001) -> dict:
     print(f"  Number of Trades:  {results['num_trades']:>10}")
 
     # Save results
-    with open(MODELS_DIR / f"backtest_{horizon}d.json", "w") as f:
-        json.dump(results, f, indent=2)
+    with span("write"):
+        with open(MODELS_DIR / f"backtest_{horizon}d.json", "w") as f:
+            json.dump(results, f, indent=2)
 
-    # Save equity curve
-    equity_df = test_df[["cumulative_strategy", "cumulative_benchmark"]].copy()
-    equity_df.index = equity_df.index.strftime("%Y-%m-%d")
-    equity_df.to_csv(MODELS_DIR / f"equity_curve_{horizon}d.csv")
+        # Save equity curve
+        equity_df = test_df[["cumulative_strategy", "cumulative_benchmark"]].copy()
+        equity_df.index = equity_df.index.strftime("%Y-%m-%d")
+        equity_df.to_csv(MODELS_DIR / f"equity_curve_{horizon}d.csv")
 
     print(f"\nResults saved to: {MODELS_DIR}")
 
     return results
 
-def run_all_backtests() -> dict:
+def rolling_windows(n_rows: int, start: int, retrain_every: int = RETRAIN_EVERY,
+                    horizon: int = 1, train_window: int = None):
+    """Yield (train, test) slices for a rolling-origin backtest.
+
+    A new origin every ``retrain_every`` rows from ``start``; each model trains on
+    rows ending ``horizon`` rows before its origin, so no training target overlaps
+    the window it forecasts. ``train_window`` caps the history (default: expanding).
+    """
+    for origin in range(start, n_rows, retrain_every):
+        train_end = origin - horizon
+        train_start = 0 if train_window is None else max(0, train_end - train_window)
+        yield slice(train_start, train_end), slice(origin, min(origin + retrain_every, n_rows))
+
+def window_keys(X: np.ndarray, y: np.ndarray, windows: list, feature_cols: list, horizon: int) -> list:
+    """Cache key for each window's models: training data, features, model code and library versions.
+
+    X and y are hashed once, row by row in order. A window's key extends the
+    digest of every row before its training end, together with its start, so
+    each window pins its training data without rehashing the whole prefix.
+    """
+    meta = hashlib.sha1()
+    for func in [*TRAINERS.values(), fit_window]:
+        meta.update(inspect.getsource(func).encode())
+    for module in (sklearn, xgboost, joblib):
+        meta.update(f"{module.__name__}={module.__version__}|".encode())
+    meta.update(f"{horizon}|{X.dtype}|{','.join(feature_cols)}".encode())
+
+    x_rows, y_rows, hashed = hashlib.sha1(), hashlib.sha1(), 0
+    keys = [None] * len(windows)
+    for i in sorted(range(len(windows)), key=lambda i: windows[i][0].stop):
+        train = windows[i][0]
+        x_rows.update(np.ascontiguousarray(X[hashed:train.stop]).data)
+        y_rows.update(np.ascontiguousarray(y[hashed:train.stop]).data)
+        hashed = max(hashed, train.stop)
+        key = meta.copy()
+        key.update(f"{x_rows.hexdigest()}|{y_rows.hexdigest()}|{train.start}:{train.stop}".encode())
+        keys[i] = key.hexdigest()
+    return keys
+
+def fit_window(X: np.ndarray, y: np.ndarray, train: slice, test: slice, path: Path, n_jobs: int = -1) -> Path:
+    """Fit the scaler and every model on one window's training rows and cache them at ``path``.
+
+    Runs in a worker process; only the path travels back, so the parent never
+    holds more than one window's models at a time. ``n_jobs`` is the thread
+    count for the models that are multithreaded.
+    """
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X[train])
+    X_test = scaler.transform(X[test])
+    models = {
+        name: trainer(X_train, y[train], X_test, y[test], **({"n_jobs": n_jobs} if name in THREADED else {}))[0]
+        for name, trainer in TRAINERS.items()
+    }
+    # Write then rename so an interrupted run never leaves a truncated cache hit
+    partial = path.with_suffix(".tmp")
+    joblib.dump({"scaler": scaler, "models": models}, partial)
+    partial.replace(path)
+    return path
+
+def prune_cache(cache_dir: Path, keep: list) -> int:
+    """Delete cached windows in ``cache_dir`` that aren't in ``keep``; return how many went."""
+    keep = set(keep)
+    stale = [path for path in cache_dir.glob("*.pkl") if path not in keep]
+    stale += list(cache_dir.glob("*.tmp"))
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return len(stale)
+
+def ensemble_predict(fitted: dict, X: np.ndarray) -> np.ndarray:
+    """Simple average of the window's models on scaled features."""
+    X = fitted["scaler"].transform(X)
+    return np.mean([model.predict(X) for model in fitted["models"].values()], axis=0)
+
+@timed("run_rolling_backtest")
+def run_rolling_backtest(horizon: int = 1, threshold: float = 0.001, retrain_every: int = RETRAIN_EVERY,
+                         train_window: int = None, n_jobs: int = -1, dtype: str = None,
+                         cache_dir: Path = None, prune: bool = True) -> dict:
+    """Walk-forward backtest that retrains every ``retrain_every`` days.
+
+    Covers the same last 20% as ``run_backtest`` but each stretch is forecast by
+    models trained only on earlier data. Windows are fitted in parallel worker
+    processes and cached under ``cache_dir``, so reruns with a different
+    threshold only re-score the stitched predictions. With ``prune``, windows
+    this run didn't use (older data, other cadences) are removed afterwards.
+    """
+    dtype = np.dtype(dtype or FEATURE_DTYPE)
+    if dtype != np.float64:
+        # Each window fits its own scaler, so raw features are rounded before scaling
+        warnings.warn(
+            f"rolling backtests round raw features to {dtype} before scaling; "
+            "XGBoost forecasts and signals can differ from float64",
+            RuntimeWarning,
+        )
+    cache_dir = Path(cache_dir or MODELS_DIR / "rolling_cache") / f"{horizon}d"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    with span("load"):
+        df = load_features(PROCESSED_DIR / "features.csv", dtype)
+
+    feature_cols = get_feature_cols(df)
+    X = df[feature_cols].to_numpy(dtype=dtype)
+    y = df[f"target_{horizon}d"].to_numpy(dtype=np.float64)
+
+    split_idx = int(len(df) * 0.8)
+    test_df = df[[f"target_{horizon}d"]].iloc[split_idx:].astype(np.float64)
+    del df
+
+    windows = list(rolling_windows(len(X), split_idx, retrain_every, horizon, train_window))
+    paths = [cache_dir / f"{key}.pkl" for key in window_keys(X, y, windows, feature_cols, horizon)]
+    missing = [i for i, path in enumerate(paths) if not path.exists()]
+
+    print(f"\n{'='*50}")
+    print(f"Rolling backtest {horizon}-day horizon (retrain every {retrain_every} days)")
+    print(f"Test period: {test_df.index[0].date()} to {test_df.index[-1].date()}")
+    print(f"Windows: {len(windows)} ({len(windows) - len(missing)} cached)")
+    print(f"{'='*50}")
+
+    # Split the cores between worker processes instead of giving every model all of them
+    workers = max(1, min(effective_n_jobs(n_jobs), len(missing)))
+    threads = max(1, cpu_count() // workers)
+    with span("fit"):
+        Parallel(n_jobs=workers)(delayed(fit_window)(X, y, *windows[i], paths[i], threads) for i in missing)
+
+    # Stitch each window's out-of-sample forecasts back together
+    with span("predict"):
+        predictions = np.concatenate([
+            ensemble_predict(joblib.load(path), X[test]) for path, (_, test) in zip(paths, windows)
+        ])
+    if prune:
+        prune_cache(cache_dir, paths)
+
+    return evaluate_predictions(test_df, predictions, horizon, threshold, extra={
+        "mode": "rolling",
+        "retrain_every": retrain_every,
+        "train_window": train_window,
+        "num_windows": len(windows),
+    })
+
+def run_all_backtests(rolling: bool = False, **kwargs) -> dict:
     """Run backtests for all horizons."""
+    backtest = run_rolling_backtest if rolling else run_backtest
     all_results = {}
     for h in HORIZONS:
-        all_results[f"{h}d"] = run_backtest(h)
+        all_results[f"{h}d"] = backtest(h, **kwargs)
 
     # Save combined results
     with open(MODELS_DIR / "backtest_summary.json", "w") as f:
@@ -135,7 +307,22 @@ def run_all_backtests() -> dict:
     return all_results
 
 if __name__ == "__main__":
-    results = run_all_backtests()
+    parser = argparse.ArgumentParser(description="Backtest the trained models.")
+    parser.add_argument("--rolling", action="store_true", help="retrain across the test period")
+    parser.add_argument("--retrain-every", type=int, default=RETRAIN_EVERY)
+    parser.add_argument("--train-window", type=int, default=None, help="rows of history (default: expanding)")
+    parser.add_argument("--threshold", type=float, default=0.001)
+    parser.add_argument("--jobs", type=int, default=-1)
+    parser.add_argument("--keep-cache", action="store_true", help="keep cached windows this run didn't use")
+    args = parser.parse_args()
+
+    kwargs = {"threshold": args.threshold}
+    if args.rolling:
+        kwargs.update(
+            retrain_every=args.retrain_every, train_window=args.train_window,
+            n_jobs=args.jobs, prune=not args.keep_cache,
+        )
+    results = run_all_backtests(args.rolling, **kwargs)
     print("\n" + "="*50)
     print("Backtesting complete for all horizons!")
     print("="*50)
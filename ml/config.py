@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 DATA_DIR = Path(__file__).parent / "data"
@@ -17,3 +18,6 @@ TICKERS = {
 
 START_DATE = "2010-01-01"
 HORIZONS = [1, 5, 20]
+
+# Set to "float32" to halve feature-matrix memory through training and inference
+FEATURE_DTYPE = os.getenv("FEATURE_DTYPE", "float64")
@@ -5,9 +5,13 @@ from ta.volatility import BollingerBands, AverageTrueRange
 from ta.momentum import RSIIndicator, StochasticOscillator
 from ta.trend import MACD, SMAIndicator, EMAIndicator
 try:
-    from .config import PROCESSED_DIR, HORIZONS, RAW_DIR
+    from .config import PROCESSED_DIR, HORIZONS, RAW_DIR, FEATURE_DTYPE
+    from .instrumentation import span, timed
 except ImportError:
-    from config import PROCESSED_DIR, HORIZONS, RAW_DIR
+    from config import PROCESSED_DIR, HORIZONS, RAW_DIR, FEATURE_DTYPE
+    from instrumentation import span, timed
+
+SCALE_CHUNK_ROWS = 1000  # rows parsed in float64 at a time by load_scaled_features
 
 def add_returns(df: pd.DataFrame, col: str = "sp500_close") -> pd.DataFrame:
     """Add return features for multiple horizons."""
@@ -96,28 +100,94 @@ def add_targets(df: pd.DataFrame, col: str = "sp500_close") -> pd.DataFrame:
         df[f"target_{h}d"] = df[col].pct_change(h).shift(-h)
     return df
 
-def create_features(input_path: str = None, output_path: str = None) -> pd.DataFrame:
+def load_features(path: str = None, dtype: str = None, columns: list = None) -> pd.DataFrame:
+    """Load features.csv, parsing feature columns straight into ``dtype``.
+
+    Targets stay float64: rounding forward returns changes what the models fit.
+    Pass ``columns`` to parse only those columns; the date index is always kept.
+    """
+    path = path or PROCESSED_DIR / "features.csv"
+    header = pd.read_csv(path, index_col=0, nrows=0).columns
+    columns = header if columns is None else columns
+    return pd.read_csv(
+        path, index_col=0, parse_dates=True,
+        usecols=[0] + [header.get_loc(c) + 1 for c in columns],
+        dtype={c: np.float64 if c.startswith("target_") else dtype or FEATURE_DTYPE for c in columns},
+    )
+
+def load_scaled_features(path, columns: list, scaler, n_rows: int, rows: slice = slice(None),
+                         fit_rows: slice = None, dtype: str = None) -> np.ndarray:
+    """Standardize ``columns`` of features.csv and return ``rows`` of the result in ``dtype``.
+
+    Values are scaled in float64 and rounded afterwards. Rounding raw columns such as
+    volume_sma_20 (~1e9) first collapses nearly equal values into ties and moves
+    XGBoost's split points; rounding scaled values gives the float32 matrix the
+    tree models would build from float64 features themselves. ``scaler`` is fitted
+    on ``fit_rows`` first when given.
+    """
+    dtype = np.dtype(dtype or FEATURE_DTYPE)
+    start, stop, _ = rows.indices(n_rows)
+
+    def chunks(first, last):
+        """Yield (position in [first, last), float64 block) for the rows in that range."""
+        offset = 0
+        for chunk in pd.read_csv(path, usecols=columns, dtype=np.float64, chunksize=SCALE_CHUNK_ROWS):
+            block = chunk[columns].to_numpy()[max(first - offset, 0):max(last - offset, 0)]
+            if len(block):
+                yield max(offset - first, 0), block
+            offset += len(chunk)
+
+    if fit_rows is not None and dtype == np.float64:
+        # Nothing to round: read once, then fit and scale in place
+        X = np.empty((n_rows, len(columns)))
+        for at, block in chunks(0, n_rows):
+            X[at:at + len(block)] = block
+        scaler.fit(X[fit_rows])
+        return scaler.transform(X[start:stop], copy=False)
+
+    if fit_rows is not None:
+        for _, block in chunks(*fit_rows.indices(n_rows)[:2]):
+            scaler.partial_fit(block)
+
+    X = np.empty((stop - start, len(columns)), dtype=dtype)
+    for at, block in chunks(start, stop):
+        X[at:at + len(block)] = scaler.transform(block)
+    return X
+
+@timed("create_features")
+def create_features(input_path: str = None, output_path: str = None, dtype: str = None) -> pd.DataFrame:
     """Full feature engineering pipeline."""
     input_path = input_path or RAW_DIR / "merged.csv"
-    df = pd.read_csv(input_path, index_col=0, parse_dates=True)
+    with span("load"):
+        df = pd.read_csv(input_path, index_col=0, parse_dates=True)
 
     print(f"Input data: {len(df)} rows, {len(df.columns)} columns")
 
-    df = add_returns(df)
-    df = add_technical_indicators(df)
-    df = add_market_features(df)
-    df = add_targets(df)
+    with span("returns"):
+        df = add_returns(df)
+    with span("technical_indicators"):
+        df = add_technical_indicators(df)
+    with span("market_features"):
+        df = add_market_features(df)
+    with span("targets"):
+        df = add_targets(df)
 
     # Lag all features by 1 to avoid look-ahead bias (except targets)
-    feature_cols = [c for c in df.columns if not c.startswith("target_")]
-    df[feature_cols] = df[feature_cols].shift(1)
+    with span("lag"):
+        feature_cols = [c for c in df.columns if not c.startswith("target_")]
+        df[feature_cols] = df[feature_cols].shift(1)
+
+        # Drop NaN rows
+        df = df.dropna()
 
-    # Drop NaN rows
-    df = df.dropna()
+    with span("write"):
+        PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+        output_path = output_path or PROCESSED_DIR / "features.csv"
+        df.to_csv(output_path)  # full precision; load_features applies the dtype
 
-    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    output_path = output_path or PROCESSED_DIR / "features.csv"
-    df.to_csv(output_path)
+    dtype = np.dtype(dtype or FEATURE_DTYPE)
+    if dtype != np.float64:
+        df = df.astype({c: dtype for c in feature_cols})
 
     print(f"Output data: {len(df)} rows, {len(df.columns)} columns")
     print(f"Saved to: {output_path}")
@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from contextvars import ContextVar
+from pathlib import Path
+
+# The metric registry is a standalone module in backend/ so the API deploys on its own
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+import sp500_telemetry as telemetry
+from sp500_telemetry import (  # noqa: F401  re-exported for pipeline code
+    Counter, Gauge, Histogram, counter, gauge, histogram, is_enabled, render_prometheus, reset, run_log, snapshot,
+)
+
+_state = {"log_path": os.getenv("INSTRUMENTATION_LOG")}
+_current_span = ContextVar("current_span", default=None)
+
+def configure(enabled: bool = True, log_path=None):
+    """Turn instrumentation on or off and optionally append spans to a JSON-lines log."""
+    telemetry.configure(enabled)
+    _state["log_path"] = str(log_path) if log_path else None
+
+RSS_SAMPLE_INTERVAL = 0.01  # seconds
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process right now, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class RssSampler:
+    """Polls the current RSS on a background thread and keeps start, end and peak."""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.start = self.end = self.peak = None
+        self._done = threading.Event()
+        self._thread = None
+
+    @property
+    def delta(self) -> int:
+        return None if self.start is None or self.end is None else self.end - self.start
+
+    def _poll(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def __enter__(self):
+        self.start = self.peak = current_rss_bytes()
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._poll, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.end = current_rss_bytes()
+            self.peak = max(self.peak, self.end)
+        return False
+
+def sample_rss(interval: float = RSS_SAMPLE_INTERVAL) -> RssSampler:
+    """Context manager measuring the start, end and peak RSS of the block it wraps."""
+    return RssSampler(interval)
+
+
+STAGE_SECONDS = histogram("pipeline_stage_seconds", "Wall time of ML pipeline stages.")
+STAGE_PEAK_RSS = gauge("pipeline_stage_peak_rss_bytes", "Highest RSS sampled while the stage ran.")
+STAGE_RSS_DELTA = gauge("pipeline_stage_rss_delta_bytes", "Change in RSS from the start to the end of the stage.")
+
+@contextmanager
+def _noop():
+    yield None
+
+@contextmanager
+def _span(name: str, fields: dict):
+    parent = _current_span.get()
+    full_name = f"{parent}.{name}" if parent else name
+    token = _current_span.set(full_name)
+    start_wall = time.time()
+    start = time.perf_counter()
+    try:
+        with sample_rss() as rss:
+            yield full_name
+    finally:
+        duration = time.perf_counter() - start
+        _current_span.reset(token)
+        STAGE_SECONDS.observe(duration, stage=full_name)
+        if rss.peak is not None:
+            STAGE_PEAK_RSS.set(rss.peak, stage=full_name)
+            STAGE_RSS_DELTA.set(rss.delta, stage=full_name)
+        record = {
+            "span": full_name,
+            "start": start_wall,
+            "duration_s": duration,
+            "rss_start_bytes": rss.start,
+            "rss_end_bytes": rss.end,
+            "rss_delta_bytes": rss.delta,
+            "peak_rss_bytes": rss.peak,
+            **fields,
+        }
+        telemetry.record_span(record)
+        if _state["log_path"]:
+            with open(_state["log_path"], "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+def span(name: str, **fields):
+    """Time a pipeline stage; nested spans are named ``parent.child``.
+
+    Returns a no-op context manager when instrumentation is disabled.
+    """
+    if not is_enabled():
+        return _noop()
+    return _span(name, fields)
+
+def timed(name: str):
+    """Decorator form of ``span`` for whole pipeline stages."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
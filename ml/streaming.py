@@ -0,0 +1,501 @@
+import json
+import logging
+import math
+import socket
+import time
+from collections import deque
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import joblib
+try:
+    from .config import MODELS_DIR, HORIZONS, RAW_DIR
+except ImportError:
+    from config import MODELS_DIR, HORIZONS, RAW_DIR
+
+logger = logging.getLogger(__name__)
+
+NAN = float("nan")
+REQUIRED_COLUMNS = {"sp500_close", "sp500_high", "sp500_low", "sp500_volume"}
+
+def _div(a: float, b: float) -> float:
+    """Divide, returning NaN instead of raising on a zero denominator."""
+    return a / b if b != 0 else NAN
+
+
+# ---------------------------------------------------------------------------
+# O(1) online indicators. Each mirrors the pandas/ta computation used in
+# feature_engineering.py and returns NaN until it has enough history.
+# ---------------------------------------------------------------------------
+
+class RollingStats:
+    """Rolling mean and standard deviation over a fixed window."""
+
+    def __init__(self, window: int, ddof: int = 1):
+        self.window = window
+        self.ddof = ddof
+        self._values = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x: float) -> None:
+        if math.isnan(x):
+            return
+        self._values.append(x)
+        n = len(self._values)
+        delta = x - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (x - self._mean)
+        if n > self.window:
+            old = self._values.popleft()
+            n -= 1
+            delta = old - self._mean
+            self._mean -= delta / n
+            self._m2 -= delta * (old - self._mean)
+
+    @property
+    def ready(self) -> bool:
+        return len(self._values) >= self.window
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.ready else NAN
+
+    @property
+    def std(self) -> float:
+        if not self.ready:
+            return NAN
+        return math.sqrt(max(self._m2, 0.0) / (self.window - self.ddof))
+
+
+class RollingExtreme:
+    """Rolling max (or min) using a monotonic deque."""
+
+    def __init__(self, window: int, mode: str = "max"):
+        self.window = window
+        self._better = (lambda a, b: a >= b) if mode == "max" else (lambda a, b: a <= b)
+        self._deque = deque()
+        self._count = 0
+
+    def update(self, x: float) -> float:
+        while self._deque and self._better(x, self._deque[-1][1]):
+            self._deque.pop()
+        self._deque.append((self._count, x))
+        if self._deque[0][0] <= self._count - self.window:
+            self._deque.popleft()
+        self._count += 1
+        return self._deque[0][1] if self._count >= self.window else NAN
+
+
+class EWM:
+    """Exponentially weighted mean with ``adjust=False`` semantics."""
+
+    def __init__(self, span: int = None, alpha: float = None, min_periods: int = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.min_periods = min_periods or span or 1
+        self._value = NAN
+        self._count = 0
+
+    def update(self, x: float) -> float:
+        if math.isnan(x):
+            return self.value
+        if self._count == 0:
+            self._value = x
+        else:
+            self._value = (1 - self.alpha) * self._value + self.alpha * x
+        self._count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._value if self._count >= self.min_periods else NAN
+
+
+class PctChange:
+    """Percent change over ``periods`` bars."""
+
+    def __init__(self, periods: int = 1):
+        self._history = deque(maxlen=periods + 1)
+
+    def update(self, x: float) -> float:
+        self._history.append(x)
+        if len(self._history) < self._history.maxlen:
+            return NAN
+        return _div(x, self._history[0]) - 1
+
+
+class RSI:
+    """Wilder RSI, matching ``ta.momentum.RSIIndicator``."""
+
+    def __init__(self, window: int = 14):
+        self._up = EWM(alpha=1 / window, min_periods=window)
+        self._down = EWM(alpha=1 / window, min_periods=window)
+        self._prev = None
+
+    def update(self, close: float) -> float:
+        diff = 0.0 if self._prev is None else close - self._prev
+        self._prev = close
+        up = self._up.update(max(diff, 0.0))
+        down = self._down.update(max(-diff, 0.0))
+        if math.isnan(down):
+            return NAN
+        if down == 0:
+            return 100.0
+        return 100 - 100 / (1 + up / down)
+
+
+class MACD:
+    """MACD line, signal and histogram, matching ``ta.trend.MACD``."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, sign: int = 9):
+        self._fast = EWM(span=fast)
+        self._slow = EWM(span=slow)
+        self._signal = EWM(span=sign)
+
+    def update(self, close: float) -> tuple:
+        macd = self._fast.update(close) - self._slow.update(close)
+        signal = self._signal.update(macd)
+        return macd, signal, macd - signal
+
+
+class ATR:
+    """Average true range, matching ``ta.volatility.AverageTrueRange``."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self._prev_close = None
+        self._seed = []
+        self._atr = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        if len(self._seed) < self.window:
+            self._seed.append(tr)
+            if len(self._seed) == self.window:
+                self._atr = sum(self._seed) / self.window
+            return self._atr
+        self._atr = (self._atr * (self.window - 1) + tr) / self.window
+        return self._atr
+
+
+class OnlineFeatures:
+    """Incrementally computes the ``create_features`` feature set one bar at a time.
+
+    After ``update`` is called with bar ``t`` the returned values equal the
+    (lagged) feature row that ``create_features`` emits for bar ``t + 1``.
+    """
+
+    def __init__(self):
+        self._returns = {h: PctChange(h) for h in [1, 5, 10, 20]}
+        self._prev_close = None
+        self._sma = {p: RollingStats(p) for p in [10, 20, 50, 200]}
+        self._ema = {p: EWM(span=p) for p in [10, 20, 50, 200]}
+        self._rsi = RSI(14)
+        self._macd = MACD()
+        self._bb = RollingStats(20, ddof=0)
+        self._atr = ATR(14)
+        self._stoch_max = RollingExtreme(14, "max")
+        self._stoch_min = RollingExtreme(14, "min")
+        self._stoch_d = RollingStats(3)
+        self._vol = {w: RollingStats(w) for w in [20, 5]}
+        self._volume_sma = RollingStats(20)
+        self._vix_change = PctChange(1)
+        self._vix_sma = RollingStats(10)
+        self._yield_change = PctChange(1)
+        self._sectors = {s: PctChange(5) for s in ["xlk", "xlf", "xle"]}
+        self.values = {}
+
+    @property
+    def ready(self) -> bool:
+        """True once every feature has enough history to be defined."""
+        return bool(self.values) and not any(math.isnan(v) for v in self.values.values())
+
+    def update(self, bar: dict) -> dict:
+        """Consume one OHLCV bar and return the updated feature values."""
+        f = {k: float(v) for k, v in bar.items() if k != "date"}
+        close = f["sp500_close"]
+        high = f["sp500_high"]
+        low = f["sp500_low"]
+        volume = f["sp500_volume"]
+
+        # Returns
+        for h, pct in self._returns.items():
+            f[f"return_{h}d"] = pct.update(close)
+        f["log_return_1d"] = NAN if self._prev_close is None else math.log(close / self._prev_close)
+        self._prev_close = close
+
+        # Moving averages
+        for p in [10, 20, 50, 200]:
+            self._sma[p].update(close)
+            f[f"sma_{p}"] = self._sma[p].mean
+            f[f"ema_{p}"] = self._ema[p].update(close)
+
+        f["rsi_14"] = self._rsi.update(close)
+        f["macd"], f["macd_signal"], f["macd_diff"] = self._macd.update(close)
+
+        # Bollinger Bands
+        self._bb.update(close)
+        mavg, mstd = self._bb.mean, self._bb.std
+        f["bb_upper"] = mavg + 2 * mstd
+        f["bb_lower"] = mavg - 2 * mstd
+        f["bb_width"] = _div(f["bb_upper"] - f["bb_lower"], mavg) * 100
+        f["bb_pct"] = _div(close - f["bb_lower"], f["bb_upper"] - f["bb_lower"])
+
+        f["atr_14"] = self._atr.update(high, low, close)
+
+        # Stochastic
+        smax = self._stoch_max.update(high)
+        smin = self._stoch_min.update(low)
+        f["stoch_k"] = 100 * _div(close - smin, smax - smin)
+        self._stoch_d.update(f["stoch_k"])
+        f["stoch_d"] = self._stoch_d.mean
+
+        # Volatility
+        for w in [20, 5]:
+            self._vol[w].update(f["return_1d"])
+            f[f"volatility_{w}"] = self._vol[w].std * np.sqrt(252)
+
+        # Price momentum
+        f["momentum_10"] = f["return_10d"]
+        f["momentum_20"] = f["return_20d"]
+
+        # Volume features
+        self._volume_sma.update(volume)
+        f["volume_sma_20"] = self._volume_sma.mean
+        f["volume_ratio"] = _div(volume, f["volume_sma_20"])
+
+        # Market features
+        if "vix_close" in f:
+            f["vix_change"] = self._vix_change.update(f["vix_close"])
+            self._vix_sma.update(f["vix_close"])
+            f["vix_sma_10"] = self._vix_sma.mean
+        if "treasury_10y_close" in f:
+            f["yield_change"] = self._yield_change.update(f["treasury_10y_close"])
+        for sector, pct in self._sectors.items():
+            col = f"{sector}_close"
+            if col in f:
+                f[f"{sector}_rel_strength"] = pct.update(f[col]) - f["return_5d"]
+
+        self.values = f
+        return f
+
+
+# ---------------------------------------------------------------------------
+# Bar sources
+# ---------------------------------------------------------------------------
+
+class FileTailSource:
+    """Yield bars appended to a CSV file, following it like ``tail -f``.
+
+    The first line must be a header (``date,sp500_open,...``) in the same
+    layout as ``merged.csv``. Iterating again after an error resumes after
+    the last complete line instead of replaying the file.
+    """
+
+    def __init__(self, path, follow: bool = True, poll_interval: float = 1.0):
+        self.path = Path(path)
+        self.follow = follow
+        self.reconnect = follow
+        self.poll_interval = poll_interval
+        self.closed = False
+        self._header = None
+        self._offset = 0
+
+    def close(self):
+        self.closed = True
+
+    def __iter__(self):
+        with open(self.path) as f:
+            f.seek(self._offset)
+            buffer = ""
+            while not self.closed:
+                chunk = f.readline()
+                if not chunk:
+                    if not self.follow:
+                        return
+                    time.sleep(self.poll_interval)
+                    continue
+                buffer += chunk
+                if not buffer.endswith("\n"):
+                    continue  # partial line, wait for the writer to finish it
+                line, buffer = buffer.strip(), ""
+                self._offset = f.tell()
+                if not line:
+                    continue
+                values = line.split(",")
+                if self._header is None:
+                    self._header = ["date"] + values[1:]
+                    continue
+                try:
+                    bar = {"date": values[0]}
+                    bar.update({k: float(v) for k, v in zip(self._header[1:], values[1:])})
+                except ValueError:
+                    logger.warning("Skipping malformed bar line: %.200s", line)
+                    continue
+                yield bar
+
+
+class SocketSource:
+    """Yield bars received as newline-delimited JSON over a TCP connection.
+
+    Each iteration opens a new connection, so ``consume`` reconnects after drops.
+    """
+
+    reconnect = True
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.closed = False
+        self._sock = None
+
+    def close(self):
+        self.closed = True
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __iter__(self):
+        with socket.create_connection((self.host, self.port)) as sock:
+            self._sock = sock
+            with sock.makefile("r") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        logger.warning("Skipping malformed bar message: %.200s", line.strip())
+
+
+def make_source(spec: str):
+    """Build a bar source from ``file:<path>`` or ``tcp://<host>:<port>``."""
+    if spec.startswith("tcp://"):
+        host, port = spec[len("tcp://"):].rsplit(":", 1)
+        return SocketSource(host, int(port))
+    if spec.startswith("file:"):
+        spec = spec[len("file:"):]
+    return FileTailSource(spec)
+
+
+# ---------------------------------------------------------------------------
+# Forecasting
+# ---------------------------------------------------------------------------
+
+class StreamingForecaster:
+    """Keeps online features current and scores the saved ensemble on each bar."""
+
+    def __init__(self, models_dir: Path = None, horizons: list = None):
+        models_dir = Path(models_dir or MODELS_DIR)
+        self.features = OnlineFeatures()
+        self.columns = set(REQUIRED_COLUMNS)
+        self.horizons = {}
+        for h in horizons or HORIZONS:
+            try:
+                self.horizons[h] = {
+                    "features": joblib.load(models_dir / f"features_{h}d.pkl"),
+                    "scaler": joblib.load(models_dir / f"scaler_{h}d.pkl"),
+                    "models": {
+                        name: joblib.load(models_dir / f"{name}_{h}d.pkl")
+                        for name in ["xgboost", "rf", "ridge"]
+                    },
+                }
+            except FileNotFoundError:
+                continue
+
+    def warm_up(self, history) -> int:
+        """Replay historical bars (DataFrame or iterable of dicts) without forecasting."""
+        if isinstance(history, pd.DataFrame):
+            history = (
+                {"date": str(idx.date()) if hasattr(idx, "date") else str(idx), **row}
+                for idx, row in zip(history.index, history.to_dict(orient="records"))
+            )
+        count = 0
+        for bar in history:
+            self.features.update(bar)
+            count += 1
+        if count:
+            # Live bars must carry every column the indicators were warmed up on
+            self.columns = set(bar) - {"date"}
+        return count
+
+    def validate(self, bar: dict):
+        """Raise before any indicator state changes if ``bar`` can't be scored."""
+        missing = self.columns - bar.keys()
+        if missing:
+            raise KeyError(f"bar is missing columns: {sorted(missing)}")
+        for col in self.columns:
+            if not math.isfinite(float(bar[col])):
+                raise ValueError(f"bar has a non-finite {col}: {bar[col]!r}")
+
+    def predict(self) -> dict:
+        """Score every loaded horizon on the current feature values."""
+        forecasts = {}
+        for h, bundle in self.horizons.items():
+            x = np.array([[self.features.values[c] for c in bundle["features"]]])
+            x = bundle["scaler"].transform(x)
+            preds = {name: float(m.predict(x)[0]) for name, m in bundle["models"].items()}
+            forecasts[f"{h}d"] = {
+                "horizon_days": h,
+                "prediction": float(np.mean(list(preds.values()))),
+                "model_predictions": preds,
+            }
+        return forecasts
+
+    def update(self, bar: dict) -> dict:
+        """Consume one bar; return a forecast event once features are warm, else None."""
+        self.validate(bar)
+        self.features.update(bar)
+        if not self.features.ready:
+            return None
+        return {"date": str(bar.get("date")), "forecasts": self.predict()}
+
+
+def load_history(path=None) -> pd.DataFrame:
+    """Load merged OHLCV history used to warm up the online indicators."""
+    path = Path(path or RAW_DIR / "merged.csv")
+    if not path.exists():
+        return pd.DataFrame()
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def consume(source, forecaster: StreamingForecaster, on_forecast, retry_interval: float = 5.0) -> int:
+    """Feed bars from ``source`` through ``forecaster``, calling ``on_forecast`` for each forecast.
+
+    Bars that fail to parse or score are logged and skipped. Sources with
+    ``reconnect`` set are reopened after errors or disconnects until closed.
+    """
+    count = 0
+    while True:
+        try:
+            for bar in source:
+                try:
+                    event = forecaster.update(bar)
+                    if event is not None:
+                        on_forecast(event)
+                        count += 1
+                except Exception:
+                    logger.exception("Skipping bar that could not be scored: %.200r", bar)
+        except Exception:
+            if not getattr(source, "reconnect", False):
+                raise
+            if not getattr(source, "closed", False):
+                logger.exception("Bar source failed; retrying in %.0fs", retry_interval)
+        else:
+            if not getattr(source, "reconnect", False):
+                return count
+        if getattr(source, "closed", False):
+            return count
+        time.sleep(retry_interval)
+
+if __name__ == "__main__":
+    import sys
+    forecaster = StreamingForecaster()
+    print(f"Warmed up on {forecaster.warm_up(load_history())} bars")
+    source = make_source(sys.argv[1] if len(sys.argv) > 1 else str(RAW_DIR / "live.csv"))
+    consume(source, forecaster, lambda event: print(json.dumps(event)))
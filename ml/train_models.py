@@ -9,9 +9,13 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import joblib
 import json
 try:
-    from .config import PROCESSED_DIR, MODELS_DIR, HORIZONS
+    from .config import PROCESSED_DIR, MODELS_DIR, HORIZONS, FEATURE_DTYPE
+    from .feature_engineering import load_features, load_scaled_features
+    from .instrumentation import span, timed
 except ImportError:
-    from config import PROCESSED_DIR, MODELS_DIR, HORIZONS
+    from config import PROCESSED_DIR, MODELS_DIR, HORIZONS, FEATURE_DTYPE
+    from feature_engineering import load_features, load_scaled_features
+    from instrumentation import span, timed
 
 def get_feature_cols(df: pd.DataFrame) -> list:
     """Get feature column names (exclude targets)."""
@@ -20,36 +24,47 @@ def get_feature_cols(df: pd.DataFrame) -> list:
 def walk_forward_split(df: pd.DataFrame, n_splits: int = 5):
     """Generate walk-forward train/test splits."""
     tscv = TimeSeriesSplit(n_splits=n_splits)
-    X = df[get_feature_cols(df)]
-    for train_idx, test_idx in tscv.split(X):
-        yield train_idx, test_idx
+    for train_idx, test_idx in tscv.split(df):
+        yield as_slice(train_idx), as_slice(test_idx)
 
-def train_xgboost(X_train, y_train, X_test, y_test) -> tuple:
-    """Train XGBoost with basic hyperparameters."""
+def as_slice(idx: np.ndarray):
+    """Turn a contiguous index array into a slice so X[idx] is a view, not a copy."""
+    if len(idx) and idx[-1] - idx[0] + 1 == len(idx):
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+    return idx
+
+def train_xgboost(X_train, y_train, X_test, y_test, n_jobs: int = -1) -> tuple:
+    """Train XGBoost with basic hyperparameters, using ``n_jobs`` threads."""
     model = XGBRegressor(
         n_estimators=100, max_depth=6, learning_rate=0.1,
-        random_state=42, n_jobs=-1, verbosity=0
+        random_state=42, n_jobs=n_jobs, verbosity=0
     )
-    model.fit(X_train, y_train)
-    preds = model.predict(X_test)
+    with span("fit"):
+        model.fit(X_train, y_train)
+    with span("predict"):
+        preds = model.predict(X_test)
     mae = mean_absolute_error(y_test, preds)
     return model, mae, preds
 
-def train_rf(X_train, y_train, X_test, y_test) -> tuple:
-    """Train Random Forest."""
+def train_rf(X_train, y_train, X_test, y_test, n_jobs: int = -1) -> tuple:
+    """Train Random Forest, using ``n_jobs`` threads."""
     model = RandomForestRegressor(
-        n_estimators=100, max_depth=10, random_state=42, n_jobs=-1
+        n_estimators=100, max_depth=10, random_state=42, n_jobs=n_jobs
     )
-    model.fit(X_train, y_train)
-    preds = model.predict(X_test)
+    with span("fit"):
+        model.fit(X_train, y_train)
+    with span("predict"):
+        preds = model.predict(X_test)
     mae = mean_absolute_error(y_test, preds)
     return model, mae, preds
 
 def train_ridge(X_train, y_train, X_test, y_test) -> tuple:
     """Train Ridge Regression."""
     model = Ridge(alpha=1.0)
-    model.fit(X_train, y_train)
-    preds = model.predict(X_test)
+    with span("fit"):
+        model.fit(X_train, y_train)
+    with span("predict"):
+        preds = model.predict(X_test)
     mae = mean_absolute_error(y_test, preds)
     return model, mae, preds
 
@@ -57,46 +72,52 @@ def calculate_directional_accuracy(y_true, y_pred) -> float:
     """Calculate percentage of correct direction predictions."""
     return float(((y_true > 0) == (y_pred > 0)).mean())
 
-def train_all_models(horizon: int = 1) -> dict:
+@timed("train_all_models")
+def train_all_models(horizon: int = 1, dtype: str = None) -> dict:
     """Train all models for a given horizon."""
-    df = pd.read_csv(PROCESSED_DIR / "features.csv", index_col=0, parse_dates=True)
-
-    feature_cols = get_feature_cols(df)
+    dtype = np.dtype(dtype or FEATURE_DTYPE)
+    path = PROCESSED_DIR / "features.csv"
     target_col = f"target_{horizon}d"
+    with span("load"):
+        feature_cols = get_feature_cols(pd.read_csv(path, index_col=0, nrows=0))
+        df = load_features(path, columns=[target_col])  # features are parsed while scaling
 
-    X = df[feature_cols].values
-    y = df[target_col].values
+    y = df[target_col].to_numpy(dtype=np.float64)
 
     # Use last split for final model
     splits = list(walk_forward_split(df))
     train_idx, test_idx = splits[-1]
 
-    X_train, X_test = X[train_idx], X[test_idx]
-    y_train, y_test = y[train_idx], y[test_idx]
+    # Scale in float64 before rounding to dtype; train and test are disjoint views of X
+    with span("scale"):
+        scaler = StandardScaler()
+        X = load_scaled_features(path, feature_cols, scaler, len(df), fit_rows=train_idx, dtype=dtype)
+    del df
 
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
+    X_train_scaled, X_test_scaled = X[train_idx], X[test_idx]
+    y_train, y_test = y[train_idx], y[test_idx]
 
     print(f"\n{'='*50}")
     print(f"Training models for {horizon}-day horizon")
-    print(f"Train size: {len(X_train)}, Test size: {len(X_test)}")
+    print(f"Train size: {len(X_train_scaled)}, Test size: {len(X_test_scaled)}")
     print(f"{'='*50}")
 
     results = {}
 
     # Train models
     print("\nTraining XGBoost...")
-    xgb_model, xgb_mae, xgb_preds = train_xgboost(X_train_scaled, y_train, X_test_scaled, y_test)
+    with span("xgboost"):
+        xgb_model, xgb_mae, xgb_preds = train_xgboost(X_train_scaled, y_train, X_test_scaled, y_test)
     xgb_dir_acc = calculate_directional_accuracy(y_test, xgb_preds)
 
     print("Training Random Forest...")
-    rf_model, rf_mae, rf_preds = train_rf(X_train_scaled, y_train, X_test_scaled, y_test)
+    with span("rf"):
+        rf_model, rf_mae, rf_preds = train_rf(X_train_scaled, y_train, X_test_scaled, y_test)
     rf_dir_acc = calculate_directional_accuracy(y_test, rf_preds)
 
     print("Training Ridge Regression...")
-    ridge_model, ridge_mae, ridge_preds = train_ridge(X_train_scaled, y_train, X_test_scaled, y_test)
+    with span("ridge"):
+        ridge_model, ridge_mae, ridge_preds = train_ridge(X_train_scaled, y_train, X_test_scaled, y_test)
     ridge_dir_acc = calculate_directional_accuracy(y_test, ridge_preds)
 
     results = {
@@ -118,11 +139,12 @@ def train_all_models(horizon: int = 1) -> dict:
         print(f"  {name:12} | MAE: {data['mae']:.6f} | Dir Acc: {data['dir_acc']:.1%}")
 
     # Save models
-    MODELS_DIR.mkdir(parents=True, exist_ok=True)
-    for name in ["xgboost", "rf", "ridge"]:
-        joblib.dump(results[name]["model"], MODELS_DIR / f"{name}_{horizon}d.pkl")
-    joblib.dump(scaler, MODELS_DIR / f"scaler_{horizon}d.pkl")
-    joblib.dump(feature_cols, MODELS_DIR / f"features_{horizon}d.pkl")
+    with span("write"):
+        MODELS_DIR.mkdir(parents=True, exist_ok=True)
+        for name in ["xgboost", "rf", "ridge"]:
+            joblib.dump(results[name]["model"], MODELS_DIR / f"{name}_{horizon}d.pkl")
+        joblib.dump(scaler, MODELS_DIR / f"scaler_{horizon}d.pkl")
+        joblib.dump(feature_cols, MODELS_DIR / f"features_{horizon}d.pkl")
 
     # Save metrics
     metrics = {
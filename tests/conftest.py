@@ -0,0 +1,24 @@
+import pytest
+import pandas as pd
+import numpy as np
+from unittest.mock import patch
+
+
+@pytest.fixture
+def features_dir(tmp_path, features_module):
+    """Write a small synthetic features.csv and point ``features_module`` at tmp_path.
+
+    Test modules define a ``features_module`` fixture naming the pipeline module
+    whose PROCESSED_DIR and MODELS_DIR should be patched.
+    """
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame(
+        rng.normal(size=(n, 6)), columns=[f"f{i}" for i in range(6)],
+        index=pd.bdate_range("2015-01-01", periods=n),
+    )
+    for h in [1, 5, 20]:
+        df[f"target_{h}d"] = df["f0"] * 0.01 + rng.normal(0, 0.001, n)
+    df.to_csv(tmp_path / "features.csv")
+    with patch(f"{features_module}.PROCESSED_DIR", tmp_path), patch(f"{features_module}.MODELS_DIR", tmp_path):
+        yield tmp_path
@@ -0,0 +1,109 @@
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import joblib
+from unittest.mock import patch
+from pathlib import Path
+import sys
+
+# Add ml directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "ml"))
+
+from backtest import fit_window, rolling_windows, run_rolling_backtest, window_keys
+
+
+@pytest.fixture
+def features_module():
+    """Module whose data and model directories features_dir patches."""
+    return "backtest"
+
+
+def test_rolling_windows_purge_and_cover():
+    """Training stops `horizon` rows before each origin and test windows tile the period."""
+    windows = list(rolling_windows(100, 80, retrain_every=8, horizon=5))
+    assert [test for _, test in windows] == [slice(80, 88), slice(88, 96), slice(96, 100)]
+    assert all(train.start == 0 and train.stop == test.start - 5 for train, test in windows)
+
+    capped = list(rolling_windows(100, 80, retrain_every=8, horizon=5, train_window=30))
+    assert all(train.stop - train.start == 30 for train, _ in capped)
+
+
+def test_window_keys_track_training_rows_only():
+    """Keys depend on each window's training rows, not on the cadence or later rows."""
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(100, 3)), rng.normal(size=100)
+    monthly = list(rolling_windows(100, 60, retrain_every=20, horizon=5))
+    weekly = list(rolling_windows(100, 60, retrain_every=5, horizon=5))
+
+    keys = window_keys(X, y, monthly, ["a", "b", "c"], 5)
+    assert len(set(keys)) == len(monthly)
+    assert keys[0] == window_keys(X, y, weekly, ["a", "b", "c"], 5)[0]
+
+    X[70] += 1  # inside the later windows' training rows only
+    changed = window_keys(X, y, monthly, ["a", "b", "c"], 5)
+    assert changed[0] == keys[0] and changed[1:] != keys[1:]
+
+
+def test_rolling_backtest_outputs(features_dir):
+    """Stitched forecasts produce the usual backtest JSON and equity curve."""
+    results = run_rolling_backtest(5, retrain_every=20, n_jobs=1)
+
+    saved = json.loads((features_dir / "backtest_5d.json").read_text())
+    equity = pd.read_csv(features_dir / "equity_curve_5d.csv", index_col=0)
+    assert saved == results
+    assert results["mode"] == "rolling" and results["num_windows"] == 3
+    assert list(equity.columns) == ["cumulative_strategy", "cumulative_benchmark"]
+    assert len(equity) == 60 and equity.index[0] == results["test_start"]
+    assert results["directional_accuracy"] > 0.8
+
+
+def test_rolling_backtest_reuses_cached_windows(features_dir):
+    """Parallel fits match serial ones, and a threshold-only rerun skips training."""
+    serial = run_rolling_backtest(1, retrain_every=20, n_jobs=1, cache_dir=features_dir / "serial")
+    parallel = run_rolling_backtest(1, retrain_every=20, n_jobs=2)
+    assert serial == parallel
+    assert len(list((features_dir / "rolling_cache" / "1d").glob("*.pkl"))) == 3
+
+    with patch("backtest.delayed", side_effect=AssertionError("retrained")):
+        rerun = run_rolling_backtest(1, threshold=0.01, retrain_every=20, n_jobs=2)
+    assert rerun["directional_accuracy"] == parallel["directional_accuracy"]
+    assert rerun["num_trades"] <= parallel["num_trades"]
+
+
+def test_fit_window_writes_its_own_cache_file(tmp_path):
+    """Workers persist the fitted window, with the thread count they were given, and hand back only its path."""
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(60, 3)), rng.normal(size=60)
+
+    path = fit_window(X, y, slice(0, 50), slice(50, 60), tmp_path / "window.pkl", n_jobs=1)
+
+    models = joblib.load(path)["models"]
+    assert path == tmp_path / "window.pkl"
+    assert set(models) == {"xgboost", "rf", "ridge"}
+    assert models["xgboost"].n_jobs == models["rf"].n_jobs == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_rolling_backtest_prunes_unused_windows(features_dir):
+    """Windows from earlier data or other cadences are dropped after a run unless kept."""
+    cache = features_dir / "rolling_cache" / "1d"
+    cache.mkdir(parents=True)
+    (cache / "stale.pkl").write_bytes(b"")
+
+    run_rolling_backtest(1, retrain_every=20, n_jobs=1, prune=False)
+    assert (cache / "stale.pkl").exists()
+
+    run_rolling_backtest(1, retrain_every=30, n_jobs=1)
+    assert not (cache / "stale.pkl").exists()
+    assert len(list(cache.glob("*.pkl"))) == 2
+
+
+def test_rolling_backtest_warns_on_reduced_precision(features_dir):
+    """Windows scale already-rounded features, so float32 runs say their signals may drift."""
+    with pytest.warns(RuntimeWarning, match="float32"):
+        run_rolling_backtest(1, retrain_every=20, n_jobs=1, dtype="float32")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+import pytest
+from pathlib import Path
+import sys
+
+# Add benchmarks directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from run_benchmarks import bench_routes, compare_to_baseline, make_ohlcv, make_tickers, measure
+from config import TICKERS
+
+
+def test_make_tickers_pads_universe():
+    """Synthetic symbols are appended after the configured tickers."""
+    tickers = make_tickers(10)
+    assert len(tickers) == 10
+    assert list(tickers)[:len(TICKERS)] == list(TICKERS)
+    assert make_tickers(3) == dict(list(TICKERS.items())[:3])
+
+
+def test_make_ohlcv_shape():
+    """Each synthetic frame has yfinance OHLCV columns and 252 bars per year."""
+    frames = make_ohlcv(2, make_tickers(2))
+    assert set(frames) == {"^GSPC", "^VIX"}
+    df = frames["^GSPC"]
+    assert len(df) == 504
+    assert list(df.columns) == ["Close", "High", "Low", "Open", "Volume"]
+    assert (df["High"] >= df["Low"]).all()
+
+
+def test_measure_counts_calls():
+    """measure runs the function repeats * number times plus one traced call."""
+    calls = []
+    result = measure(lambda: calls.append(1), repeats=2, number=3)
+    assert len(calls) == 7
+    assert result["per_call_seconds"] <= result["seconds"]
+    assert "peak_alloc_bytes" in result
+
+
+def test_measure_rss_is_per_benchmark():
+    """RSS is sampled during the measured calls rather than read from the process high-water mark."""
+    import numpy as np
+
+    big = measure(lambda: np.ones(40_000_000).sum(), memory=False)  # ~320 MB
+    small = measure(lambda: None, memory=False)
+
+    assert big["rss_increase_bytes"] > 200e6
+    assert small["rss_increase_bytes"] < 50e6
+    assert small["peak_rss_bytes"] < big["peak_rss_bytes"]
+
+
+def test_compare_to_baseline():
+    """Only slowdowns past both the ratio threshold and noise floor are flagged."""
+    baseline = {"benchmarks": {"pipeline": {
+        "slow": {"seconds": 1.0, "peak_alloc_bytes": 1e8},
+        "noisy": {"seconds": 0.001},
+        "fast": {"seconds": 1.0},
+    }}}
+    results = {"benchmarks": {"pipeline": {
+        "slow": {"seconds": 2.0, "peak_alloc_bytes": 1e8},
+        "noisy": {"seconds": 0.004},
+        "fast": {"seconds": 0.5},
+        "new": {"seconds": 9.0},
+    }}}
+
+    regressions = compare_to_baseline(results, baseline, threshold=0.25)
+
+    assert [(r["benchmark"], r["metric"]) for r in regressions] == [("pipeline.slow", "seconds")]
+    assert regressions[0]["ratio"] == pytest.approx(2.0)
+
+
+def test_compare_routes_to_baseline():
+    """Route slowdowns use their own noise floor, and any new errors are regressions."""
+    baseline = {"benchmarks": {"routes": {
+        "/api/health": {"seconds": 0.011, "errors": 0},
+        "/api/data/summary": {"seconds": 0.010, "errors": 0},
+        "/metrics": {"seconds": 0.017, "errors": 0},
+    }}}
+    results = {"benchmarks": {"routes": {
+        "/api/health": {"seconds": 0.050, "errors": 0},
+        "/api/data/summary": {"seconds": 0.016, "errors": 0},
+        "/metrics": {"seconds": 0.017, "errors": 3},
+    }}}
+
+    regressions = compare_to_baseline(results, baseline, threshold=0.5)
+
+    assert [(r["benchmark"], r["metric"]) for r in regressions] == [
+        ("routes./api/health", "seconds"),
+        ("routes./metrics", "errors"),
+    ]
+
+
+def test_stream_routes_time_first_snapshot(tmp_path):
+    """The SSE and WebSocket streams are benchmarked up to their snapshot event."""
+    from unittest.mock import patch
+
+    streams = ["/api/stream/forecasts", "/api/stream/ws"]
+    with patch("run_benchmarks.ROUTES", streams):
+        results = bench_routes(tmp_path, concurrency=2, requests=4)
+
+    assert list(results) == streams
+    assert all(result["errors"] == 0 for result in results.values())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
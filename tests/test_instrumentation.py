@@ -0,0 +1,194 @@
+import pytest
+import json
+from pathlib import Path
+import sys
+
+# Add ml and backend directories to path
+root = Path(__file__).parent.parent
+sys.path.insert(0, str(root / "ml"))
+sys.path.insert(0, str(root / "backend"))
+
+import instrumentation
+from instrumentation import configure, counter, histogram, render_prometheus, run_log, span, timed
+
+
+@pytest.fixture
+def enabled(tmp_path):
+    """Enable instrumentation with a JSON-lines log for the duration of a test."""
+    instrumentation.reset()
+    configure(enabled=True, log_path=tmp_path / "run_log.jsonl")
+    yield tmp_path / "run_log.jsonl"
+    configure(enabled=False)
+    instrumentation.reset()
+
+
+def test_disabled_records_nothing():
+    """Spans and metrics are no-ops while instrumentation is off."""
+    configure(enabled=False)
+    instrumentation.reset()
+    with span("stage"):
+        pass
+    counter("test_disabled_total").inc()
+    assert run_log() == []
+    assert counter("test_disabled_total").values == {}
+
+
+def test_nested_spans(enabled):
+    """Nested spans are named parent.child and written to the run log."""
+    @timed("stage")
+    def stage():
+        with span("load"):
+            pass
+
+    stage()
+
+    names = [record["span"] for record in run_log()]
+    assert names == ["stage.load", "stage"]
+    assert all(record["duration_s"] >= 0 for record in run_log())
+    lines = enabled.read_text().splitlines()
+    assert [json.loads(line)["span"] for line in lines] == names
+
+
+def test_span_rss_is_per_stage(enabled):
+    """A small stage after a large one reports its own RSS peak, not the process high-water mark."""
+    import numpy as np
+
+    with span("large"):
+        block = np.ones(50_000_000)  # 400 MB, touched; alive until the span ends
+    del block
+    with span("small"):
+        pass
+
+    large, small = run_log()
+    assert large["peak_rss_bytes"] - small["peak_rss_bytes"] > 300e6
+    assert abs(small["rss_delta_bytes"]) < 50e6
+    assert small["rss_start_bytes"] > 0
+
+
+def test_render_prometheus(enabled):
+    """Histograms render cumulative buckets, sum and count."""
+    hist = histogram("test_latency_seconds", "Test latency.", buckets=(0.1, 1))
+    hist.observe(0.05, route="/a")
+    hist.observe(0.5, route="/a")
+
+    text = render_prometheus()
+
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 2' in text
+    assert 'test_latency_seconds_count{route="/a"} 2' in text
+
+
+def test_label_values_are_escaped(enabled):
+    """Quotes, backslashes and newlines in label values keep the exposition valid."""
+    counter("test_escape_total").inc(artifact='a"b\\c\nd')
+
+    assert 'test_escape_total{artifact="a\\"b\\\\c\\nd"} 1' in render_prometheus()
+
+
+def test_route_template_with_literal_parameter_value(enabled):
+    """A path parameter equal to a literal segment still maps to its route template."""
+    from fastapi import APIRouter, FastAPI
+    from fastapi.testclient import TestClient
+    from api.middleware import MetricsMiddleware
+
+    router = APIRouter()
+
+    @router.get("/{item}/items")
+    def get_item(item: str):
+        return {"item": item}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/items")
+    app.add_middleware(MetricsMiddleware)
+    TestClient(app).get("/items/items/items")
+
+    assert 'route="/items/{item}/items",status="200"} 1' in render_prometheus()
+
+
+def test_create_features_spans(enabled, tmp_path):
+    """Feature engineering reports a span per sub-step."""
+    import numpy as np
+    import pandas as pd
+    from unittest.mock import patch
+    from feature_engineering import create_features
+
+    n = 260
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, n)))
+    df = pd.DataFrame(
+        {"sp500_close": close, "sp500_high": close * 1.01, "sp500_low": close * 0.99, "sp500_volume": 1e6},
+        index=pd.bdate_range("2015-01-01", periods=n),
+    )
+    df.to_csv(tmp_path / "merged.csv")
+    with patch("feature_engineering.PROCESSED_DIR", tmp_path):
+        create_features(tmp_path / "merged.csv", tmp_path / "features.csv")
+
+    names = [record["span"] for record in run_log()]
+    assert names[-1] == "create_features"
+    for step in ["load", "technical_indicators", "lag", "write"]:
+        assert f"create_features.{step}" in names
+    assert run_log()[-1]["peak_rss_bytes"] > 0
+
+
+def test_metrics_endpoint(enabled):
+    """The API exposes route latency and artifact cache hits."""
+    from fastapi.testclient import TestClient
+    from main import app
+    from api import artifacts
+
+    artifacts.clear()
+    with TestClient(app) as client:
+        client.get("/api/metrics/")
+        client.get("/api/metrics/")
+        client.get("/api/data/equity-curve/5")
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/metrics/",status="200"} 2' in response.text
+    assert 'route="/api/data/equity-curve/{horizon}",status="200"} 1' in response.text
+    assert 'artifact_cache_requests_total{artifact="metrics_1d.json",result="hit"} 1' in response.text
+    assert "http_requests_in_flight" in response.text
+
+
+def test_backend_runs_without_ml(tmp_path):
+    """backend/ deploys on its own (Railway/Render root directory) with metrics intact."""
+    import shutil
+    import subprocess
+
+    backend = tmp_path / "backend"
+    shutil.copytree(root / "backend", backend, ignore=shutil.ignore_patterns("__pycache__", "models"))
+    script = (
+        "from fastapi.testclient import TestClient; import main; "
+        "client = TestClient(main.app); client.get('/api/health'); "
+        "print(client.get('/metrics').text)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=backend, capture_output=True, text=True,
+        env={"PATH": "", "INSTRUMENTATION": "1"},
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert 'route="/api/health",status="200"} 1' in result.stdout
+
+
+def test_pipeline_shares_registry_without_importing_api(tmp_path):
+    """ml/ records into the backend registry even when another top-level ``api`` comes first."""
+    import subprocess
+
+    (tmp_path / "api.py").write_text("raise ImportError('wrong api module')\n")
+    script = (
+        "import instrumentation, sp500_telemetry, sys; "
+        "assert instrumentation.telemetry is sp500_telemetry; "
+        "assert 'api' not in sys.modules"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True,
+        env={"PATH": "", "PYTHONPATH": f"{tmp_path}:{root / 'ml'}"},
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,246 @@
+import pytest
+import pandas as pd
+import numpy as np
+import joblib
+from unittest.mock import patch
+from pathlib import Path
+import sys
+
+# Add ml and backend directories to path
+root = Path(__file__).parent.parent
+sys.path.insert(0, str(root / "ml"))
+sys.path.insert(0, str(root / "backend"))
+
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+from feature_engineering import create_features
+from streaming import (
+    OnlineFeatures, RollingExtreme, FileTailSource, StreamingForecaster, consume, make_source, SocketSource
+)
+
+
+@pytest.fixture
+def merged_data():
+    """Synthetic merged OHLCV data shaped like data_collection output."""
+    rng = np.random.default_rng(0)
+    n = 320
+    dates = pd.bdate_range("2015-01-01", periods=n)
+    cols = {}
+    for name, base in [("sp500", 2000), ("vix", 20), ("treasury_10y", 2.5), ("xlk", 40), ("xlf", 20), ("xle", 60)]:
+        close = base * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        cols[f"{name}_close"] = close
+        cols[f"{name}_high"] = close * (1 + rng.uniform(0, 0.01, n))
+        cols[f"{name}_low"] = close * (1 - rng.uniform(0, 0.01, n))
+        cols[f"{name}_open"] = close
+        cols[f"{name}_volume"] = rng.uniform(1e6, 1e7, n)
+    return pd.DataFrame(cols, index=dates)
+
+
+def test_online_features_match_batch(merged_data, tmp_path):
+    """Online indicators reproduce the lagged create_features output."""
+    merged_data.to_csv(tmp_path / "merged.csv")
+    with patch("feature_engineering.PROCESSED_DIR", tmp_path):
+        batch = create_features(tmp_path / "merged.csv", tmp_path / "features.csv")
+
+    online = OnlineFeatures()
+    rows = {}
+    dates = merged_data.index
+    for i, row in enumerate(merged_data.to_dict(orient="records")):
+        values = online.update(row)
+        if i + 1 < len(dates):
+            rows[dates[i + 1]] = dict(values)
+    online_df = pd.DataFrame.from_dict(rows, orient="index").loc[batch.index]
+
+    feature_cols = [c for c in batch.columns if not c.startswith("target_")]
+    assert set(feature_cols) == set(online_df.columns)
+    np.testing.assert_allclose(online_df[feature_cols].values, batch[feature_cols].values, rtol=1e-6)
+
+
+def test_rolling_extreme():
+    """Monotonic-deque max matches a brute-force rolling max."""
+    values = np.random.default_rng(1).normal(size=50)
+    rolling = RollingExtreme(5, "max")
+    out = [rolling.update(v) for v in values]
+    expected = pd.Series(values).rolling(5).max().values
+    np.testing.assert_allclose(out[4:], expected[4:])
+    assert np.isnan(out[:4]).all()
+
+
+def test_file_tail_source(merged_data, tmp_path):
+    """File source yields one float bar per CSV row."""
+    path = tmp_path / "bars.csv"
+    merged_data.head(3).to_csv(path)
+
+    bars = list(FileTailSource(path, follow=False))
+
+    assert len(bars) == 3
+    assert bars[0]["date"] == "2015-01-01"
+    assert bars[0]["sp500_close"] == pytest.approx(merged_data["sp500_close"].iloc[0])
+
+
+def test_make_source(tmp_path):
+    """Source specs map to the matching source type."""
+    assert isinstance(make_source(f"file:{tmp_path}/bars.csv"), FileTailSource)
+    source = make_source("tcp://localhost:9000")
+    assert isinstance(source, SocketSource)
+    assert source.port == 9000
+
+
+@pytest.fixture
+def models_dir(merged_data, tmp_path):
+    """Save a 1d ensemble (three copies of one Ridge) over every online feature."""
+    warm = OnlineFeatures()
+    for row in merged_data.to_dict(orient="records"):
+        warm.update(row)
+    feature_cols = sorted(warm.values)
+    X = np.random.default_rng(2).normal(size=(50, len(feature_cols)))
+    y = X[:, 0] * 0.01
+    scaler = StandardScaler().fit(X)
+    model = Ridge().fit(scaler.transform(X), y)
+    for name in ["xgboost", "rf", "ridge"]:
+        joblib.dump(model, tmp_path / f"{name}_1d.pkl")
+    joblib.dump(scaler, tmp_path / "scaler_1d.pkl")
+    joblib.dump(feature_cols, tmp_path / "features_1d.pkl")
+    return tmp_path
+
+
+def live_bars(merged_data, n: int = 5) -> list:
+    return [{"date": str(d.date()), **row} for d, row in zip(merged_data.index[-n:], merged_data.iloc[-n:].to_dict(orient="records"))]
+
+
+def test_streaming_forecaster(merged_data, models_dir):
+    """Forecaster warms up, then emits an ensemble forecast per bar."""
+    forecaster = StreamingForecaster(models_dir, horizons=[1, 5])
+    assert list(forecaster.horizons) == [1]
+
+    forecaster.warm_up(merged_data.iloc[:-5])
+    events = []
+    bars = live_bars(merged_data)
+    assert consume(bars, forecaster, events.append) == 5
+
+    forecast = events[-1]["forecasts"]["1d"]
+    assert events[-1]["date"] == str(merged_data.index[-1].date())
+    assert set(forecast["model_predictions"]) == {"xgboost", "rf", "ridge"}
+    assert forecast["prediction"] == pytest.approx(np.mean(list(forecast["model_predictions"].values())))
+
+
+def test_consume_skips_bad_bars(merged_data, models_dir):
+    """Unparseable or incomplete bars are skipped without disturbing the indicators."""
+    forecaster = StreamingForecaster(models_dir)
+    forecaster.warm_up(merged_data.iloc[:-5])
+    bars = live_bars(merged_data)
+    empty_field = {**bars[1], "sp500_close": ""}
+    missing_column = {k: v for k, v in bars[2].items() if k != "vix_close"}
+    events = []
+
+    assert consume([bars[0], empty_field, missing_column, *bars[1:]], forecaster, events.append) == 5
+
+    clean = StreamingForecaster(models_dir)
+    clean.warm_up(merged_data.iloc[:-5])
+    expected = [clean.update(bar) for bar in bars]
+    assert events == expected
+
+
+def test_file_tail_source_skips_malformed_lines(merged_data, tmp_path):
+    """A line with an empty field is dropped and the rest still stream."""
+    path = tmp_path / "bars.csv"
+    merged_data.head(3).to_csv(path)
+    lines = path.read_text().splitlines()
+    lines.insert(2, lines[2].split(",", 1)[0] + "," * (len(merged_data.columns)))
+    path.write_text("\n".join(lines) + "\n")
+
+    bars = list(FileTailSource(path, follow=False))
+
+    assert [bar["date"] for bar in bars] == ["2015-01-01", "2015-01-02", "2015-01-05"]
+
+
+def test_consume_reconnects(merged_data, models_dir):
+    """Reconnecting sources are retried after a failure instead of ending the stream."""
+    bars = live_bars(merged_data, 2)
+
+    class FlakySource:
+        reconnect = True
+        closed = False
+
+        def __init__(self):
+            self.attempts = 0
+
+        def __iter__(self):
+            self.attempts += 1
+            if self.attempts == 1:
+                raise ConnectionRefusedError("connection refused")
+            yield bars[self.attempts - 2]
+            if self.attempts == 3:
+                self.closed = True
+
+    forecaster = StreamingForecaster(models_dir)
+    forecaster.warm_up(merged_data.iloc[:-2])
+    source = FlakySource()
+    events = []
+
+    assert consume(source, forecaster, events.append, retry_interval=0) == 2
+    assert source.attempts == 3
+    assert [event["date"] for event in events] == [bar["date"] for bar in bars]
+
+
+def test_forecaster_waits_for_warm_features(merged_data, tmp_path):
+    """No forecast is emitted until every indicator has enough history."""
+    forecaster = StreamingForecaster(tmp_path)
+    assert forecaster.update(merged_data.iloc[0].to_dict()) is None
+
+
+def test_websocket_sends_snapshot():
+    """WebSocket clients receive the dashboard snapshot on connect."""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/stream/ws") as ws:
+            message = ws.receive_json()
+    assert message["event"] == "snapshot"
+    assert {"metrics", "predictions", "equity_curve", "features", "summary"} <= set(message["data"])
+
+
+def test_websocket_close_releases_subscriber():
+    """A client that disconnects is unsubscribed without waiting for the next forecast."""
+    import asyncio
+    from api.routes import stream
+
+    class ClosingSocket:
+        def __init__(self):
+            self.sent = []
+
+        async def accept(self):
+            pass
+
+        async def send_json(self, message):
+            self.sent.append(message)
+
+        async def receive(self):
+            return {"type": "websocket.disconnect", "code": 1000}
+
+    ws = ClosingSocket()
+    asyncio.run(asyncio.wait_for(stream.forecasts_ws(ws), timeout=5))
+
+    assert [message["event"] for message in ws.sent] == ["snapshot"]
+    assert not stream.broadcaster._subscribers
+
+
+def test_stream_rejects_invalid_horizon():
+    """Unknown horizons get a 400 before the SSE or WebSocket stream starts."""
+    from fastapi.testclient import TestClient
+    from starlette.testclient import WebSocketDenialResponse
+    from main import app
+
+    with TestClient(app) as client:
+        response = client.get("/api/stream/forecasts", params={"horizon": 3})
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid horizon"}
+        with pytest.raises(WebSocketDenialResponse) as denial:
+            with client.websocket_connect("/api/stream/ws?horizon=3"):
+                pass
+        assert denial.value.status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,72 @@
+import pytest
+import pandas as pd
+import numpy as np
+import joblib
+from pathlib import Path
+import sys
+
+# Add ml directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "ml"))
+
+from train_models import as_slice, train_all_models, walk_forward_split
+from feature_engineering import load_features
+
+
+@pytest.fixture
+def features_module():
+    """Module whose data and model directories features_dir patches."""
+    return "train_models"
+
+
+def test_as_slice():
+    """Contiguous index arrays become slices; gapped ones pass through."""
+    assert as_slice(np.arange(3, 8)) == slice(3, 8)
+    gapped = np.array([1, 2, 5])
+    assert as_slice(gapped) is gapped
+
+
+def test_walk_forward_split_yields_views():
+    """Fold slices index X without copying."""
+    df = pd.DataFrame({"a": range(100), "target_1d": range(100)})
+    X = df.to_numpy()
+    train_idx, test_idx = list(walk_forward_split(df))[-1]
+    assert np.shares_memory(X[train_idx], X)
+    assert X[test_idx][0, 0] == X[train_idx][-1, 0] + 1
+
+
+def test_load_features_dtype(features_dir):
+    """Feature columns are parsed directly into the requested dtype; targets stay float64."""
+    df = load_features(features_dir / "features.csv", "float32")
+    targets = [c for c in df.columns if c.startswith("target_")]
+    assert (df.drop(columns=targets).dtypes == np.float32).all()
+    assert (df[targets].dtypes == np.float64).all()
+    assert isinstance(df.index, pd.DatetimeIndex)
+
+
+def test_saved_scaler_does_not_modify_input(features_dir):
+    """In-place scaling during training doesn't leak into the saved scaler."""
+    train_all_models(1)
+    scaler = joblib.load(features_dir / "scaler_1d.pkl")
+    x = np.ones((2, 6))
+
+    scaler.transform(x)
+
+    assert scaler.copy
+    np.testing.assert_array_equal(x, np.ones((2, 6)))
+
+
+def test_float32_training_tracks_float64(features_dir):
+    """Every model reproduces float64, even with a large raw column that float32 can't resolve."""
+    df = pd.read_csv(features_dir / "features.csv", index_col=0)
+    df["f5"] = 1e9 + df["f5"] * 100  # volume-sized; float32 spacing here is 64
+    df.to_csv(features_dir / "features.csv")
+
+    results64 = train_all_models(1, dtype="float64")
+    results32 = train_all_models(1, dtype="float32")
+
+    for name in ["xgboost", "rf", "ridge"]:
+        np.testing.assert_allclose(results32[name]["preds"], results64[name]["preds"], atol=1e-6)
+    assert results32["ensemble"]["mae"] == pytest.approx(results64["ensemble"]["mae"], rel=1e-4)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])